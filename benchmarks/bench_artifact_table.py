@@ -0,0 +1,84 @@
+"""
+ArtifactTable: memory held by the loaded workunit data, compared with the nested dictionaries
+the loader used to build (one dict per artifact with a "children" dict).
+"""
+import gc
+import os
+import random
+import sqlite3
+import tracemalloc
+
+import pytest
+
+from synthetic_pver import workunit_db
+from widgets.pver_widget import PverLoadWorker
+
+ARTIFACTS = 100000
+
+
+@pytest.fixture(scope="module")
+def workunit(tmp_path_factory):
+    """
+    PVER folder with a synthetic workunit database of ARTIFACTS artifacts.
+    """
+    root = str(tmp_path_factory.mktemp("workunit"))
+    workunit_db(root, {}, ARTIFACTS, random.Random(1))
+    return root
+
+
+def _dict_tree(relations, details, parent_id=1):
+    """
+    Artifact tree in the nested dictionary format of the former loader.
+    """
+    children_dict = {}
+    for child in relations.get(parent_id, []):
+        cls, name, variant, Upd, file_name, path, ext, size, crc = details[child]
+        if file_name and ext:
+            file_name = "{}.{}".format(file_name, ext)
+            path = os.path.join(path, file_name)
+        children_dict[name] = {"cls": cls, "variant": variant, "Upd": Upd,
+                               "f_name": file_name, "path": path, "ext": ext,
+                               "size": str(size), "crc": crc}
+        children_dict[name]["children"] = _dict_tree(relations, details, child)
+    return children_dict
+
+
+def _load(root, build):
+    worker = PverLoadWorker(root)
+    worker.conn = sqlite3.connect(os.path.join(root, "workunit.lws.cc.db3"))
+    worker.cursor = worker.conn.cursor()
+    try:
+        return build(worker)
+    finally:
+        worker.cursor.close()
+        worker.conn.close()
+
+
+def _retained(build):
+    """
+    Result of build and the bytes still allocated by it once the build is done.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_artifact_table_memory(benchmark, workunit):
+    tree, dict_bytes = _retained(lambda: _load(workunit, lambda worker: _dict_tree(
+        worker.get_relations(), worker.get_details())))
+    del tree
+
+    table, table_bytes = benchmark.pedantic(
+        _retained, args=(lambda: _load(workunit, lambda worker: worker.fetch()[0]),),
+        rounds=1, iterations=1)
+
+    benchmark.extra_info["artifacts"] = len(table)
+    benchmark.extra_info["dict_tree_bytes"] = dict_bytes
+    benchmark.extra_info["artifact_table_bytes"] = table_bytes
+    benchmark.extra_info["ratio"] = round(dict_bytes / table_bytes, 2)
+    assert table_bytes < dict_bytes
@@ -0,0 +1,10 @@
+"""
+bct.get_arguments: configuration items, bamf actions and the buildframework closure.
+"""
+from tools import bct
+
+
+def bench_bct_get_arguments(benchmark, pver):
+    arguments = benchmark(bct.get_arguments, pver.bct_modified, pver.bamf_paths,
+                          pver.conf_paths, pver.cfg_paths, pver.pm_paths)
+    assert arguments
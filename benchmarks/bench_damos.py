@@ -0,0 +1,38 @@
+"""
+damos.get_command: pavast index, system constants, sysconds and the SMB pavast file.
+"""
+import os
+
+from tools import damos, doc_cache, pavast_index
+
+
+def _prepare(pver):
+    damos.PATH = pver.root
+    damos.WORKING_PATH = os.path.join(pver.root, '_smb')
+    damos.DICT_INIT_COMMAND = {}
+
+
+def _get_command(pver):
+    return damos.get_command(list(pver.modified_pavasts), list(pver.pavasts))
+
+
+def _cold():
+    """
+    Forget the stored pavast index and the parsed documents.
+    """
+    index_path = os.path.join(damos.PATH, '_smb', 'damos', pavast_index.INDEX_FILE)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    doc_cache.documents.invalidate()
+
+
+def bench_damos_get_command(benchmark, pver):
+    _prepare(pver)
+    command, _ = benchmark(_get_command, pver)
+    assert command
+
+
+def bench_damos_get_command_cold(benchmark, pver):
+    _prepare(pver)
+    command, _ = benchmark.pedantic(_get_command, args=(pver,), setup=_cold, rounds=3)
+    assert command
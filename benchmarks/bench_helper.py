@@ -0,0 +1,45 @@
+"""
+helper.resolve_all: system constants of the synthetic pavast files, compared with the regex
+evaluation of every constant (see regex_evaluate.py).
+"""
+import os
+
+import pytest
+
+import regex_evaluate
+from tools import damos, helper
+from tools.pavast_index import PavastIndex
+
+
+@pytest.fixture
+def values(pver):
+    paths = [os.path.join(pver.root, path) for path in pver.pavasts]
+    index = PavastIndex(paths)
+    return damos.get_unresolved_value(damos.extract_system_constant(paths, index), index)
+
+
+def _regex_resolve(values):
+    resolved = {}
+    for name, value in values.items():
+        try:
+            resolved[name] = regex_evaluate.evaluate(value, values, 'system_const')
+        except Exception:
+            pass
+    return resolved
+
+
+def bench_resolve_all(benchmark, values):
+    resolved, _ = benchmark(helper.resolve_all, values)
+    assert resolved
+
+
+def bench_resolve_all_cold(benchmark, values):
+    # without the compiled expressions of the previous rounds
+    resolved, _ = benchmark.pedantic(helper.resolve_all, args=(values,),
+                                     setup=helper.compile_expression.cache_clear, rounds=5)
+    assert resolved
+
+
+def bench_resolve_regex(benchmark, values):
+    resolved = benchmark.pedantic(_regex_resolve, args=(values,), rounds=3)
+    assert resolved
@@ -0,0 +1,20 @@
+"""
+PverLoadWorker.fetch: artifact tree of the workunit database.
+"""
+import os
+import sqlite3
+
+from widgets.pver_widget import PverLoadWorker
+
+
+def bench_pver_load_fetch(benchmark, pver):
+    worker = PverLoadWorker(pver.root)
+    worker.conn = sqlite3.connect(os.path.join(pver.root, "workunit.lws.cc.db3"))
+    worker.cursor = worker.conn.cursor()
+
+    try:
+        tree, arxml_files = benchmark(worker.fetch)
+    finally:
+        worker.cursor.close()
+        worker.conn.close()
+    assert tree and arxml_files
@@ -0,0 +1,13 @@
+"""
+rtegen.get_command: SW component paths of the selected arxml files.
+"""
+import os
+
+from tools import rtegen
+
+
+def bench_rtegen_get_command(benchmark, pver):
+    rtegen.PATH = pver.root
+    rtegen.WORKING_PATH = os.path.join(pver.root, '_smb')
+    command, _ = benchmark(rtegen.get_command, pver.swc_paths, pver.arxml_paths)
+    assert command
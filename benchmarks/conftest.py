@@ -0,0 +1,44 @@
+"""
+Benchmarks of the tool preparation on synthetic PVERs (see synthetic_pver.py).
+
+run:
+    python -m pytest benchmarks
+    BENCH_SCALES=small,medium,large python -m pytest benchmarks --benchmark-autosave
+
+requires pytest-benchmark; the PVERs are generated once per session in a temporary folder.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_pver import generate
+
+SCALES = {
+    "small": dict(pavasts=50, constants=200, sysconds=100, actions=50, bamfs=5, swcs=20,
+                  artifacts=2000),
+    "medium": dict(pavasts=200, constants=1000, sysconds=500, actions=200, bamfs=20, swcs=100,
+                   artifacts=20000),
+    "large": dict(pavasts=1000, constants=5000, sysconds=3000, actions=800, bamfs=60, swcs=400,
+                  artifacts=100000),
+}
+
+
+def pytest_generate_tests(metafunc):
+    if "pver" in metafunc.fixturenames:
+        scales = os.environ.get("BENCH_SCALES", "small,medium").split(',')
+        metafunc.parametrize("pver", [scale.strip() for scale in scales if scale.strip()],
+                             indirect=True, scope="session")
+
+
+@pytest.fixture(scope="session")
+def pver(request, tmp_path_factory):
+    """
+    Synthetic PVER of the requested scale.
+    """
+    scale = request.param
+    root = str(tmp_path_factory.mktemp(f"pver_{scale}"))
+    return generate(root, **SCALES[scale])
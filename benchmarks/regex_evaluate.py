@@ -0,0 +1,83 @@
+"""
+Regex evaluation of the DAMOS expressions, as done before helper.compile_expression.
+Kept as the reference of the tests and of the resolve_all benchmark: every expression is
+normalized with the regular expressions of helper and evaluated again on each call.
+"""
+from numbers import Integral, Real
+
+from tools import helper
+
+
+def eval_nested(eval_str, use_dict, nested_cnt=0):
+    """
+    Call eval for each nested expression beginning from inside.
+    """
+    this_str = ''
+    other_str = ''
+    brace_cnt = 0
+    for char in eval_str:
+        if char == ')':
+            brace_cnt -= 1
+            if brace_cnt == 0:
+                this_str += eval_nested(other_str, use_dict=use_dict, nested_cnt=nested_cnt + 1)
+                other_str = ''
+                continue
+            elif brace_cnt < 0:
+                raise SyntaxError('invalid syntax')
+        elif char == '(':
+            brace_cnt += 1
+            if brace_cnt == 1:
+                continue
+
+        if brace_cnt > 0:
+            other_str += char
+        else:
+            this_str += char
+    if brace_cnt != 0:
+        raise SyntaxError('unexpected EOF while parsing')
+    if nested_cnt:
+        return '(' + str(eval(this_str, dict(use_dict))) + ')'
+    return eval(this_str, dict(use_dict))
+
+
+def evaluate(value_str, original_values, type, post_eval=True):
+    """
+    Evaluate the value string, the referenced elements are replaced by the text of their
+    value in original_values.
+    """
+    replaced = helper.re_find_comment.sub('', value_str)
+    if type == 'system_const':
+        replaced = helper.re_find_value_tag.sub("", replaced)
+    elif type == 'syscond':
+        replaced = helper.re_find_cond_tag.sub(r"\g<2>", replaced)
+    replaced = helper.re_find_whitespace.sub("", replaced)
+
+    if helper.re_find_sc.findall(replaced):
+        match = helper.re_find_sc.sub(lambda x: str(original_values[x.group(2)]),
+                                      replaced).strip()
+        replaced = str(evaluate(match, original_values, type, post_eval=False))
+
+    if helper.re_find_sc_decoded.findall(replaced):
+        match = helper.re_find_sc_decoded.sub(lambda x: str(original_values[x.group(1)]),
+                                              replaced).strip()
+        replaced = str(evaluate(match, original_values, type, post_eval=False))
+
+    if replaced.isdigit():
+        return int(replaced) if post_eval else replaced
+    if replaced.count('.') == 1 and replaced.replace('.', '').isdigit():
+        return float(replaced) if post_eval else replaced
+
+    replaced = helper.re_find_not.sub(r' not \g<1>', replaced)
+    replaced = helper.re_find_digit_u.sub(r'\g<1>', replaced)
+    replaced = helper.re_find_operators.sub(lambda x: helper.char_html_dict[x.group(1)],
+                                            replaced).strip()
+    replaced = replaced.replace('||', ' or ').replace('&&', ' and ')
+    replaced = helper.re_find_defined.sub(lambda x: original_values[x.group(3)], replaced).strip()
+    replaced = helper.re_find_false.sub('False', replaced)
+    replaced = helper.re_find_true.sub('True', replaced)
+    replaced = helper.re_val_oct_check.sub(lambda x: x.group(1) + 'o' + x.group(2), replaced)
+
+    replaced = eval_nested(replaced, helper.damos)
+    if isinstance(replaced, (Real, Integral)):
+        return replaced
+    return evaluate(replaced, original_values, type, post_eval=False)
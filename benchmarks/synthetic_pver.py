@@ -0,0 +1,405 @@
+"""
+Synthetic PVER generator for the benchmarks.
+Writes a PVER tree with the files read by the tools (pavast files, .opt files, schedule,
+All_Commands.log, buildframework configuration, .bamf/.pm files, arxml SWCs) and a matching
+workunit.lws.cc.db3, so the tools can be timed on Linux without a real PVER.
+
+usage:
+    python benchmarks/synthetic_pver.py <root> --pavasts 200 --constants 1000 --sysconds 500
+"""
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+from collections import namedtuple
+
+Pver = namedtuple("Pver", ["root",
+                           "pavasts",            # all *_pavast.xml, relative to root
+                           "modified_pavasts",   # selected *_pavast.xml, relative to root
+                           "bamf_paths",         # .bamf files of selected BAMF artifacts
+                           "bct_modified",       # selected configuration files and their .bamf
+                           "conf_paths",         # selected configuration files
+                           "cfg_paths",          # buildframework.cfg and buildframework-roles.cfg
+                           "pm_paths",           # all .pm files
+                           "arxml_paths",        # all arxml files
+                           "swc_paths",          # selected arxml files
+                           ])
+
+AUTOSAR_NS = "http://autosar.org/schema/r4.0"
+SWC_TYPES = ["APPLICATION-SW-COMPONENT-TYPE", "SENSOR-ACTUATOR-SW-COMPONENT-TYPE",
+             "SERVICE-SW-COMPONENT-TYPE", "COMPLEX-DEVICE-DRIVER-SW-COMPONENT-TYPE"]
+TASKS = ["Task_10ms", "Task_20ms", "Task_100ms", "Task_Init"]
+
+
+def _write(root: str, relative: str, content: str) -> str:
+    path = os.path.join(root, *relative.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write(content)
+    return relative
+
+
+def _spread(total: int, parts: int, position: int) -> int:
+    """
+    Share of position when total items are spread over parts.
+    """
+    return total // parts + (1 if position < total % parts else 0)
+
+
+def pavast_file(index: int, count: int, constants: int, sysconds: int, rnd: random.Random) -> str:
+    """
+    *_pavast.xml of a component: variables, system constants, services and the
+    import/export interface. The references only point to earlier files, except the imports.
+    """
+    variables = [f"v_{index}_{k}" for k in range(6)]
+    names = [f"SC_{index}_{k}" for k in range(max(1, constants))]
+
+    lines = ["<?xml version='1.0' encoding='ISO-8859-1'?>", "<MSRSW>",
+             "<CATEGORY>PaVaSt</CATEGORY>",
+             "<SW-SYSTEMS><SW-SYSTEM><SHORT-NAME>MEDC17</SHORT-NAME>",
+             "<SW-DATA-DICTIONARY-SPEC>", "<SW-VARIABLES>"]
+    for variable in variables:
+        refs = ""
+        if index > 0 and rnd.random() < 0.6:
+            refs += (f"<SW-DATA-CONSTR-REF>v_{rnd.randrange(index)}_{rnd.randrange(6)}"
+                     f"</SW-DATA-CONSTR-REF>")
+        if rnd.random() < 0.4:
+            refs += f"<SW-SYSTEMCONST-REF>{rnd.choice(names)}</SW-SYSTEMCONST-REF>"
+        if rnd.random() < 0.3:
+            refs += (f"<SW-VALUE-CONT><VF><SW-SYSTEMCONST-REF>{rnd.choice(names)}"
+                     f"</SW-SYSTEMCONST-REF></VF></SW-VALUE-CONT>")
+        lines.append(f"<SW-VARIABLE><SHORT-NAME>{variable}</SHORT-NAME>"
+                     f"<LONG-NAME>Variable {variable}</LONG-NAME>"
+                     f"<CATEGORY>VALUE</CATEGORY>{refs}</SW-VARIABLE>")
+
+    lines.append("</SW-VARIABLES><SW-SYSTEMCONSTS>")
+    for position, name in enumerate(names):
+        kind = rnd.random()
+        if position == 0 or kind < 0.3:
+            value = f"<VF>{rnd.randint(0, 9)}</VF>"
+        elif kind < 0.5:
+            value = (f"<VF><SW-SYSTEMCONST-REF>{names[position - 1]}</SW-SYSTEMCONST-REF>"
+                     f" * 2 + 1u</VF>")
+        elif kind < 0.7:
+            value = f"<VF>ICEIL(<SW-SYSTEMCONST-REF>{names[0]}</SW-SYSTEMCONST-REF> / 4)</VF>"
+        elif kind < 0.85:
+            value = (f"<VF>(<SW-SYSTEMCONST-REF>{names[0]}</SW-SYSTEMCONST-REF> &gt; 3) "
+                     f"&amp;&amp; !(<SW-SYSTEMCONST-REF>{names[position - 1]}"
+                     f"</SW-SYSTEMCONST-REF> == 2)</VF>")
+        else:
+            value = f"<VT>/* coded */ (P({names[0]}) + 3)</VT>"
+        lines.append(f"<SW-SYSTEMCONST><SHORT-NAME>{name}</SHORT-NAME>"
+                     f"<SW-VALUES-PHYS>{value}</SW-VALUES-PHYS></SW-SYSTEMCONST>")
+
+    lines.append("</SW-SYSTEMCONSTS><SW-SERVICES>")
+    for task in range(2):
+        accessed = "".join(
+            f"<SW-ACCESSED-VARIABLE><SW-VARIABLE-REF>{rnd.choice(variables)}</SW-VARIABLE-REF>"
+            f"<SW-VARIABLE-USAGE>{rnd.choice(['READ', 'WRITE', 'READWRITE'])}"
+            f"</SW-VARIABLE-USAGE></SW-ACCESSED-VARIABLE>" for _ in range(3))
+        lines.append(f"<SW-SERVICE><SHORT-NAME>proc_{index}_{task}</SHORT-NAME>"
+                     f"<CATEGORY>PROCESS</CATEGORY><SW-SERVICE-ACCESSED-ELEMENT-SETS>"
+                     f"<SW-SERVICE-ACCESSED-ELEMENT-SET><SW-ACCESSED-VARIABLES>{accessed}"
+                     f"</SW-ACCESSED-VARIABLES></SW-SERVICE-ACCESSED-ELEMENT-SET>"
+                     f"</SW-SERVICE-ACCESSED-ELEMENT-SETS></SW-SERVICE>")
+    lines.append("</SW-SERVICES></SW-DATA-DICTIONARY-SPEC>")
+
+    lines.append(f"<SW-COMPONENT-SPEC><SW-COMPONENTS><SW-FEATURE><SHORT-NAME>F{index}</SHORT-NAME>"
+                 f"<SW-FEATURE-OWNED-ELEMENTS><SW-FEATURE-ELEMENTS><SW-VARIABLE-REFS>")
+    lines += [f"<SW-VARIABLE-REF>{variable}</SW-VARIABLE-REF>" for variable in variables]
+    lines.append("</SW-VARIABLE-REFS><SW-SYSTEMCONST-REFS>")
+    lines += [f"<SW-SYSTEMCONST-REF>{name}</SW-SYSTEMCONST-REF>" for name in names]
+    lines.append("</SW-SYSTEMCONST-REFS></SW-FEATURE-ELEMENTS></SW-FEATURE-OWNED-ELEMENTS>"
+                 "<SW-FEATURE-INTERFACES><SW-FEATURE-INTERFACE><SW-INTERFACE-EXPORTS>"
+                 "<SW-INTERFACE-EXPORT><SW-FEATURE-ELEMENTS><SW-VARIABLE-REFS>")
+    lines += [f"<SW-VARIABLE-REF>{variable}</SW-VARIABLE-REF>" for variable in variables[:2]]
+    lines.append("</SW-VARIABLE-REFS><SW-SYSTEMCONST-REFS>")
+    lines.append(f"<SW-SYSTEMCONST-REF>{names[0]}</SW-SYSTEMCONST-REF>")
+    lines.append("</SW-SYSTEMCONST-REFS></SW-FEATURE-ELEMENTS></SW-INTERFACE-EXPORT>"
+                 "</SW-INTERFACE-EXPORTS><SW-INTERFACE-IMPORTS><SW-INTERFACE-IMPORT>"
+                 "<SW-FEATURE-ELEMENTS><SW-VARIABLE-REFS>")
+    for position in range(max(4, sysconds)):
+        other = rnd.randrange(count)
+        variable = f"v_{other}_{rnd.randrange(6)}"
+        if position < sysconds:
+            lines.append(f"<SW-VARIABLE-REF-SYSCOND><SW-VARIABLE-REF>{variable}</SW-VARIABLE-REF>"
+                         f"<SW-SYSCOND><SW-SYSTEMCONST-REF>SC_{other}_0</SW-SYSTEMCONST-REF>"
+                         f" &gt;= {rnd.randint(0, 9)}</SW-SYSCOND></SW-VARIABLE-REF-SYSCOND>")
+        else:
+            lines.append(f"<SW-VARIABLE-REF>{variable}</SW-VARIABLE-REF>")
+    lines.append("</SW-VARIABLE-REFS></SW-FEATURE-ELEMENTS></SW-INTERFACE-IMPORT>"
+                 "</SW-INTERFACE-IMPORTS></SW-FEATURE-INTERFACE></SW-FEATURE-INTERFACES>"
+                 "</SW-FEATURE></SW-COMPONENTS></SW-COMPONENT-SPEC>"
+                 "</SW-SYSTEM></SW-SYSTEMS></MSRSW>")
+    return "\n".join(lines)
+
+
+def buildframework_cfg(actions: list, rnd: random.Random) -> str:
+    """
+    buildframework.cfg: every action produces one ECUC role and consumes a few roles of the
+    earlier actions, some actions have predecessors.
+    """
+    lines = ["<?xml version='1.0' encoding='UTF-8'?>", "<buildframework>"]
+    for position, action in enumerate(actions):
+        inputs = ""
+        for other in rnd.sample(range(position), min(position, 2)):
+            inputs += (f'<input type="ECUC_IN"><IOMapping roleId="role_ecuc_out_{actions[other]}"/>'
+                       f'</input>')
+        outputs = f'<output><IOMapping roleId="role_ecuc_out_{action}"/></output>'
+        predecessors = ""
+        if position > 0 and rnd.random() < 0.3:
+            predecessors = f'<predecessor name="{actions[rnd.randrange(position)]}"/>'
+        lines.append(f'<action id="{action}">{inputs}{outputs}{predecessors}</action>')
+    lines.append("</buildframework>")
+    return "\n".join(lines)
+
+
+def roles_cfg(actions: list, rnd: random.Random) -> str:
+    """
+    buildframework-roles.cfg: .pm roles listing the actions they run.
+    """
+    lines = ["<?xml version='1.0' encoding='UTF-8'?>", "<roles>"]
+    for action in actions[::5]:
+        members = " ".join(rnd.sample(actions, min(3, len(actions))) + [action])
+        lines.append(f'<role id="role_pm_{action}"><description>runs \'{members}\'</description>'
+                     f'<property name="type" value="pm"/>'
+                     f'<property name="filter" value="{action}"/></role>')
+    lines.append("</roles>")
+    return "\n".join(lines)
+
+
+def pm_file(action: str, actions: list, rnd: random.Random) -> str:
+    lines = ["# generated process module", "package Conf;", "sub run {"]
+    for other in rnd.sample(actions, min(4, len(actions))):
+        lines.append(f"    {other}_process::conf_run($ctx);")
+    lines.append(f"    conf_process::finish('{action}');")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def conf_file(items: list) -> str:
+    lines = ["<?xml version='1.0' encoding='UTF-8'?>", "<MSRSW><SW-SYSTEMS><SW-SYSTEM>",
+             "<SHORT-NAME>MEDC17</SHORT-NAME><CONF-SPEC><CONF-ITEMS>"]
+    lines += [f"<CONF-ITEM><SHORT-NAME>{item}</SHORT-NAME><VALUE>1</VALUE></CONF-ITEM>"
+              for item in items]
+    lines.append("</CONF-ITEMS></CONF-SPEC></SW-SYSTEM></SW-SYSTEMS></MSRSW>")
+    return "\n".join(lines)
+
+
+def bamf_file(actions: list, conf_items: list, rnd: random.Random) -> str:
+    lines = ["<?xml version='1.0' encoding='UTF-8'?>", "<BAMF><BUILD-ACTIONS>"]
+    for action in actions:
+        inputs = "".join(f"<BUILD-ACTION-IO-ELEMENT><ECUC-DEFINITION-REF>/MEDC17/{item}"
+                         f"</ECUC-DEFINITION-REF></BUILD-ACTION-IO-ELEMENT>"
+                         for item in rnd.sample(conf_items, min(2, len(conf_items))))
+        lines.append(f"<BUILD-ACTION><SHORT-NAME>{action}</SHORT-NAME>"
+                     f"<INPUT-DATAS>{inputs}</INPUT-DATAS>"
+                     f"<CREATED-DATAS><BUILD-ACTION-IO-ELEMENT><CATEGORY>ARTIFACT</CATEGORY>"
+                     f"</BUILD-ACTION-IO-ELEMENT></CREATED-DATAS></BUILD-ACTION>")
+    lines.append("</BUILD-ACTIONS></BAMF>")
+    return "\n".join(lines)
+
+
+def arxml_file(index: int, components: int, rnd: random.Random) -> str:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             f'<AUTOSAR xmlns="{AUTOSAR_NS}"><AR-PACKAGES>',
+             f"<AR-PACKAGE><SHORT-NAME>Pkg{index}</SHORT-NAME><AR-PACKAGES>",
+             f"<AR-PACKAGE><SHORT-NAME>SwComponentTypes</SHORT-NAME><ELEMENTS>"]
+    for component in range(components):
+        swc_type = rnd.choice(SWC_TYPES)
+        lines.append(f"<{swc_type}><SHORT-NAME>Swc{index}_{component}</SHORT-NAME><PORTS>"
+                     f"<P-PORT-PROTOTYPE><SHORT-NAME>Port{component}</SHORT-NAME>"
+                     f"</P-PORT-PROTOTYPE></PORTS></{swc_type}>")
+    lines.append("</ELEMENTS></AR-PACKAGE></AR-PACKAGES></AR-PACKAGE>")
+    lines.append(f"<AR-PACKAGE><SHORT-NAME>EcucDefs{index}</SHORT-NAME><ELEMENTS>"
+                 f"<ECUC-MODULE-DEF><SHORT-NAME>Module{index}</SHORT-NAME></ECUC-MODULE-DEF>"
+                 f"</ELEMENTS></AR-PACKAGE>")
+    lines.append("</AR-PACKAGES></AUTOSAR>")
+    return "\n".join(lines)
+
+
+def _md5(root: str, relative: str) -> (int, str):
+    path = os.path.join(root, *relative.split('/'))
+    with open(path, 'rb') as file:
+        content = file.read()
+    return len(content), hashlib.md5(content).hexdigest().upper()
+
+
+def workunit_db(root: str, groups: dict, artifacts: int, rnd: random.Random):
+    """
+    workunit.lws.cc.db3 with one artifact per generated file grouped below component
+    artifacts, padded with documentation artifacts up to the requested count
+    (their files are listed in the database but not written).
+    """
+    path = os.path.join(root, "workunit.lws.cc.db3")
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE Artifacts (Id INTEGER PRIMARY KEY, Class TEXT, Name TEXT, "
+        "Variant TEXT, Upd TEXT);"
+        "CREATE TABLE Relations (ParentId INTEGER, ChildId INTEGER);"
+        "CREATE TABLE Files (ArtifactId INTEGER, Name TEXT, FilePath TEXT, Extension TEXT, "
+        "FileSize INTEGER, CRC TEXT);")
+    artifact_rows, relation_rows, file_rows = [(1, "PVER", "PVER", "1", "0")], [], []
+
+    def add(parent, cls, name, relative=None):
+        identifier = len(artifact_rows) + 1
+        artifact_rows.append((identifier, cls, name, "1", "0"))
+        relation_rows.append((parent, identifier))
+        if relative is not None:
+            size, crc = _md5(root, relative)
+            folder, file_name = os.path.split(relative)
+            stem, ext = os.path.splitext(file_name)
+            file_rows.append((identifier, stem, folder.replace('/', '\\'), ext[1:], size, crc))
+        return identifier
+
+    containers = []
+    for group, (cls, paths) in groups.items():
+        container = add(1, "COMP", group)
+        containers.append(container)
+        for relative in paths:
+            add(container, cls, os.path.basename(relative).rsplit('.', 1)[0], relative)
+
+    padding = artifacts - len(artifact_rows)
+    for position in range(max(0, padding)):
+        identifier = add(rnd.choice(containers) if containers else 1, "DOCMISC", f"doc_{position}")
+        file_rows.append((identifier, f"doc_{position}", f"DOC\\Doc{position // 1000}", "pdf",
+                          rnd.randrange(1, 1 << 20), "%032X" % rnd.getrandbits(128)))
+
+    conn.executemany("INSERT INTO Artifacts VALUES (?,?,?,?,?)", artifact_rows)
+    conn.executemany("INSERT INTO Relations VALUES (?,?)", relation_rows)
+    conn.executemany("INSERT INTO Files VALUES (?,?,?,?,?,?)", file_rows)
+    conn.commit()
+    conn.close()
+
+
+def generate(root: str, pavasts: int = 50, constants: int = 200, sysconds: int = 100,
+             actions: int = 50, bamfs: int = 5, swcs: int = 20, artifacts: int = 2000,
+             seed: int = 1) -> Pver:
+    """
+    Write a synthetic PVER below root and return the paths given to the tools.
+        pavasts: number of *_pavast.xml files
+        constants: number of system constants, spread over the pavast files
+        sysconds: number of *-REF-SYSCOND imports, spread over the pavast files
+        actions: number of buildframework actions
+        bamfs: number of .bamf files
+        swcs: number of arxml files containing SW components
+        artifacts: number of artifacts in the workunit database
+    """
+    rnd = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+
+    _write(root, "medc17_tools.ini", "PRJ_BUILD_NAME=mdgb\nPRJ_NAME=SYNTH\n")
+    _write(root, "MAK/MakeWare/swbuild_config.xml",
+           "<MSRSW><ABLOCKS><ABLOCK><SDGS><SDG GID='SWBProjectConfiguration'>"
+           "<SD GID='PRJ_NAME'>SYNTH</SD></SDG></SDGS></ABLOCK></ABLOCKS></MSRSW>")
+    _write(root, "_bin/swb/SYNTH.hex", ":00000001FF\n")
+    _write(root, "_bin/swb/SYNTH.a2l", "/begin PROJECT SYNTH /end PROJECT\n")
+    os.makedirs(os.path.join(root, "_out"), exist_ok=True)
+
+    # pavast files, the first components are mandatory (CEL/GENC)
+    pavast_paths = []
+    for index in range(pavasts):
+        component = "CEL" if index < max(1, pavasts // 50) else f"COMP{index % 7}"
+        pavast_paths.append(_write(
+            root, f"{component}/C{index}/c{index}_pavast.xml",
+            pavast_file(index, pavasts, _spread(constants, pavasts, index),
+                        _spread(sysconds, pavasts, index), rnd)))
+    modified_pavasts = pavast_paths[:max(1, pavasts // 10)]
+
+    # schedule, option files, file lists and commands
+    _write(root, "_gen/swb/module/os/sched.xml",
+           "<OS>" + "".join(
+               f"<OS_TASK><OS_TASKNAME>{task}</OS_TASKNAME>" +
+               "".join(f"<OS_PROCESS>proc_{index}_{position % 2}</OS_PROCESS>"
+                       for index in range(position, pavasts, len(TASKS))) +
+               "</OS_TASK>" for position, task in enumerate(TASKS)) + "</OS>")
+    lists = "_gen/swb/filegroup/src_lists"
+    _write(root, f"{lists}/condsys_pavast_files.lst",
+           "\n".join(pavast_paths[:max(1, pavasts // 20)]) + "\n")
+    _write(root, f"{lists}/coregen_pavast_files.lst",
+           "\n".join(pavast_paths[::3]) + "\n")
+    _write(root, f"{lists}/pavast_files.lst", "\n".join(pavast_paths) + "\n")
+    options = ["--pavast_files\t_gen/swb/filegroup/src_lists/pavast_files.lst",
+               "--coregen_pavast_files\t_gen/swb/filegroup/src_lists/coregen_pavast_files.lst",
+               "--os_auto_conf_sched_file\t_gen/swb/module/os/sched.xml",
+               "--data_tmp_dir\t_gen/swb/module/data/tmp",
+               "--log\t_log/swb/damos.log",
+               "--verbose"]
+    for name in ("damos", "dgs_ice"):
+        _write(root, f"_gen/swb/module/data/opt/{name}.opt", "\n".join(options) + "\n")
+    commands = ["# generated build commands"]
+    commands += [f"cmd.exe /q /c call tool_{index}.exe --in _gen/swb/module/step{index}"
+                 for index in range(20)]
+    commands += ["cmd.exe /q /c call damoskdo.exe --optionsfile "
+                 "_gen/swb/module/data/opt/damos.opt --prj_root C:/PVER",
+                 "dgs_ice.cmd --optionsfile _gen/swb/module/data/opt/dgs_ice.opt "
+                 "--prj_root C:/PVER"]
+    _write(root, "_log/swb/All_Commands.log", "\n".join(commands) + "\n")
+
+    # build framework, bamf and pm files
+    action_names = [f"Act{index}" for index in range(actions)]
+    conf_items = [f"Item{index}" for index in range(max(4, actions // 2))]
+    persistence = ".buildframework/default/persistence"
+    cfg_paths = [_write(root, f"{persistence}/buildframework.cfg",
+                        buildframework_cfg(action_names, rnd)),
+                 _write(root, f"{persistence}/buildframework-roles.cfg",
+                        roles_cfg(action_names, rnd))]
+    pm_paths = [_write(root, f"MAK/pm/{action}.pm", pm_file(action, action_names, rnd))
+                for action in action_names[::5]]
+    bamf_paths = []
+    for index in range(bamfs):
+        owned = action_names[index::max(1, bamfs)]
+        bamf_paths.append(_write(root, f"CONF/Mod{index}/mod{index}.bamf",
+                                 bamf_file(owned, conf_items, rnd)))
+    conf_paths = []
+    for index in range(max(1, bamfs // 2)):
+        conf_paths.append(_write(root, f"CONF/Mod{index}/mod{index}_conf.xml",
+                                 conf_file(conf_items[index::max(1, bamfs)])))
+
+    # arxml SW components
+    arxml_paths = [_write(root, f"ARXML/Swc{index}/swc{index}.arxml",
+                          arxml_file(index, 5, rnd)) for index in range(swcs)]
+
+    workunit_db(root, {"PAVAST": ("TDATA", pavast_paths),
+                       "CONF": ("CONFDATA", conf_paths),
+                       "BAMF": ("BAMF", bamf_paths),
+                       "PM": ("CONFPROC", pm_paths),
+                       "ARXML": ("SWCD", arxml_paths)}, artifacts, rnd)
+
+    def absolute(paths):
+        return [os.path.join(root, *path.split('/')).replace('\\', '/') for path in paths]
+
+    return Pver(root=root,
+                pavasts=pavast_paths,
+                modified_pavasts=modified_pavasts,
+                bamf_paths=absolute(bamf_paths[:1]),
+                bct_modified=absolute(conf_paths + bamf_paths[:len(conf_paths)]),
+                conf_paths=absolute(conf_paths),
+                cfg_paths=absolute(cfg_paths),
+                pm_paths=absolute(pm_paths),
+                arxml_paths=absolute(arxml_paths),
+                swc_paths=absolute(arxml_paths[:max(1, swcs // 10)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic PVER for the benchmarks")
+    parser.add_argument("root")
+    parser.add_argument("--pavasts", type=int, default=50)
+    parser.add_argument("--constants", type=int, default=200)
+    parser.add_argument("--sysconds", type=int, default=100)
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--bamfs", type=int, default=5)
+    parser.add_argument("--swcs", type=int, default=20)
+    parser.add_argument("--artifacts", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    pver = generate(**vars(args))
+    print(f"PVER written to {pver.root}: {len(pver.pavasts)} pavast files, "
+          f"{len(pver.bamf_paths)} bamf files, {len(pver.arxml_paths)} arxml files")
+
+
+if __name__ == "__main__":
+    main()
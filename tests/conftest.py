@@ -0,0 +1,27 @@
+"""
+Tests of the tools and of the PVER tree.
+
+run:
+    python -m pytest tests
+
+the Qt tests run on the offscreen platform, no display is needed.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# the synthetic PVER files of the benchmarks
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """
+    Application shared by the Qt tests.
+    """
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,52 @@
+"""
+Paths collected from the arxml files by arxml_scanner and rtegen.
+"""
+from lxml import etree
+
+from tools import arxml_scanner, rtegen
+
+# namespaced document with a comment and a processing instruction around the root
+ARXML = """<?xml version="1.0" encoding="UTF-8"?>
+<!-- generated -->
+<?xml-stylesheet type="text/xsl" href="autosar.xsl"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0">
+<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>P</SHORT-NAME><ELEMENTS>
+<SERVICE-SW-COMPONENT-TYPE><SHORT-NAME>S1</SHORT-NAME></SERVICE-SW-COMPONENT-TYPE>
+<APPLICATION-SW-COMPONENT-TYPE><SHORT-NAME>C1</SHORT-NAME></APPLICATION-SW-COMPONENT-TYPE>
+<ECUC-MODULE-DEF><SHORT-NAME>M1</SHORT-NAME></ECUC-MODULE-DEF>
+<ECUC-MODULE-CONFIGURATION-VALUES><SHORT-NAME>V1</SHORT-NAME>
+<DEFINITION-REF DEST="ECUC-MODULE-DEF">/P/M1</DEFINITION-REF>
+</ECUC-MODULE-CONFIGURATION-VALUES>
+</ELEMENTS>
+<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>Q</SHORT-NAME><ELEMENTS>
+<APPLICATION-SW-COMPONENT-TYPE><SHORT-NAME>C2</SHORT-NAME></APPLICATION-SW-COMPONENT-TYPE>
+</ELEMENTS></AR-PACKAGE></AR-PACKAGES>
+</AR-PACKAGE></AR-PACKAGES>
+</AUTOSAR>
+<!-- end -->
+"""
+
+
+def _write(tmp_path):
+    path = tmp_path / "prolog.arxml"
+    path.write_text(ARXML, encoding="utf-8")
+    return str(path)
+
+
+def test_scan_file_prolog(tmp_path):
+    scan = arxml_scanner.scan_file(_write(tmp_path))
+    assert scan.components == [("SERVICE-SW-COMPONENT-TYPE", "/P/S1"),
+                               ("APPLICATION-SW-COMPONENT-TYPE", "/P/C1"),
+                               ("APPLICATION-SW-COMPONENT-TYPE", "/P/Q/C2")]
+    assert scan.module_defs == ["/P/M1"]
+    assert scan.definition_refs == ["/P/M1"]
+
+
+def test_scan_tree(tmp_path):
+    path = _write(tmp_path)
+    assert arxml_scanner.scan_tree(etree.parse(path).getroot()) == arxml_scanner.scan_file(path)
+
+
+def test_contract_argument_prolog(tmp_path):
+    # grouped by component type in the order of COMPONENT_TYPES
+    assert rtegen.get_contract_argument(_write(tmp_path)) == ["/P/C1", "/P/Q/C2", "/P/S1"]
@@ -0,0 +1,12 @@
+"""
+DAMOS command preparation.
+"""
+from tools import damos
+
+
+def test_workers_setting():
+    assert damos.workers_setting(None) == 0
+    assert damos.workers_setting("") == 0
+    assert damos.workers_setting("4") == 4
+    assert damos.workers_setting("-2") == 0
+    assert damos.workers_setting("many") == 0
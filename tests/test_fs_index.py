@@ -0,0 +1,73 @@
+"""
+File index of a PVER and the watcher keeping it up to date.
+"""
+import os
+import time
+
+from utilities import fs_index, watcher
+from utilities.check import HashCache
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(path)
+
+
+def _tree(root):
+    for path in ["a/a_pavast.xml", "a/b/b.pm", "c/c.bamf", "_gen/out.bamf"]:
+        _touch(os.path.join(root, path))
+
+
+def _later(path):
+    # directory mtimes may not change within the resolution of the file system
+    stamp = time.time() + 10
+    os.utime(path, (stamp, stamp))
+
+
+def test_refresh(tmp_path):
+    root = str(tmp_path)
+    _tree(root)
+    index = fs_index.FileIndex(root)
+    assert index.refresh() == []
+
+    _touch(os.path.join(root, "a", "b", "new.pm"))
+    _touch(os.path.join(root, "d", "d.pm"))
+    os.remove(os.path.join(root, "c", "c.bamf"))
+    for directory in ["a/b", "c", ""]:
+        _later(os.path.join(root, directory))
+    changed = index.refresh()
+
+    assert sorted(changed) == sorted([root, os.path.join(root, "a", "b"),
+                                      os.path.join(root, "c")])
+    assert sorted(index.glob("*.pm")) == sorted(os.path.join(root, path) for path in
+                                                ["a/b/b.pm", "a/b/new.pm", "d/d.pm"])
+    assert index.glob("*.bamf") == [os.path.join(root, "_gen", "out.bamf")]
+    assert index.refresh() == []
+    assert [path for path in fs_index.FileIndex(root).walk(root)] == list(index.walk(root))
+
+
+def test_watcher_flush(qapp, tmp_path):
+    root = str(tmp_path)
+    _tree(root)
+    fs_index.get(root, refresh=True)
+    cache = HashCache()
+    cache.md5(os.path.join(root, "c", "c.bamf"))
+    pver_watcher = watcher.PverWatcher(root, cache)
+    assert pver_watcher.start()
+    assert os.path.join(root, "_gen") not in pver_watcher._watcher.directories()
+
+    os.remove(os.path.join(root, "c", "c.bamf"))
+    _touch(os.path.join(root, "d", "d.pm"))
+    pver_watcher.on_directory_changed(os.path.join(root, "c"))
+    pver_watcher.on_directory_changed(root)
+    changed = pver_watcher.flush()
+
+    assert sorted(changed) == sorted([os.path.join(root, "c", "c.bamf"),
+                                      os.path.join(root, "d", "d.pm")])
+    assert not cache.entries
+    assert pver_watcher.dirty == set()
+    assert os.path.join(root, "d") in pver_watcher._watcher.directories()
+    assert fs_index.get(root).glob("*.bamf") == [os.path.join(root, "_gen", "out.bamf")]
+    pver_watcher.stop()
+    fs_index.invalidate(root)
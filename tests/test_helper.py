@@ -0,0 +1,92 @@
+"""
+Compiled DAMOS expressions compared with the regex evaluation they replace.
+"""
+import pytest
+
+import regex_evaluate
+from tools import helper
+
+
+def _ref(name):
+    return f"<SW-SYSTEMCONST-REF>{name}</SW-SYSTEMCONST-REF>"
+
+
+# the referenced values are strings, C refers to A
+VALUES = {"A": "4", "B": "2", "Z": "0", "C": f"<VF>({_ref('A')} * 2 + 1u)</VF>"}
+
+SYSTEM_CONSTS = {
+    "ICEIL": f"<VF>ICEIL({_ref('A')} / 3)</VF>",
+    "IFLOOR": f"<VF>IFLOOR({_ref('A')} / 3)</VF>",
+    "NESTED": f"<VF>ICEIL({_ref('C')} / 4)</VF>",
+    "NESTED_MUL": f"<VF>{_ref('C')} * 2</VF>",
+    "UNSIGNED": "<VF>2u * 3u + 1u</VF>",
+    "LEADING_ZERO": "<VF>017</VF>",
+    "FLOAT": "<VF>1.5</VF>",
+    "CODED": "<VT>/* coded */ (P(A) + 3)</VT>",
+    "CODED_I": "<VT>i(B) * 5</VT>",
+    "AND": f"<VF>({_ref('A')} &gt; 3) &amp;&amp; !({_ref('B')} == 2)</VF>",
+    "OR": f"<VF>({_ref('A')} &lt; 3) || ({_ref('B')} == 2)</VF>",
+    "DEFINED": "<VF>defined(A) &amp;&amp; !defined(Z)</VF>",
+    "BOOLEAN": "<VF>TRUE || FALSE</VF>",
+}
+
+SYSCONDS = [
+    f"<SW-SYSCOND>({_ref('A')} &gt;= 4) &amp;&amp; defined(B)</SW-SYSCOND>",
+    f"<SW-SYSCOND>ICEIL({_ref('C')} / 2) == 5 || !defined(Z)</SW-SYSCOND>",
+    f"<SW-SYSCOND>IFLOOR({_ref('A')} / 3) != 1u</SW-SYSCOND>",
+]
+
+
+def _same(value, expected):
+    return value == expected and type(value) is type(expected)
+
+
+@pytest.mark.parametrize("name", list(SYSTEM_CONSTS))
+def test_system_const(name):
+    expected = regex_evaluate.evaluate(SYSTEM_CONSTS[name], VALUES, 'system_const')
+    assert _same(helper.evaluate(SYSTEM_CONSTS[name], VALUES, 'system_const'), expected)
+    assert helper.evaluate(SYSTEM_CONSTS[name], VALUES, 'system_const',
+                           post_eval=False) == str(expected)
+
+
+@pytest.mark.parametrize("condition", SYSCONDS)
+def test_syscond(condition):
+    expected = regex_evaluate.evaluate(condition, VALUES, 'syscond')
+    assert _same(helper.evaluate(condition, VALUES, 'syscond'), expected)
+
+
+def test_resolve_all():
+    values = dict(VALUES, **SYSTEM_CONSTS)
+    resolved, unresolved = helper.resolve_all(values)
+    assert unresolved == {}
+    assert list(resolved) == list(values)
+    for name, value in values.items():
+        assert _same(resolved[name], regex_evaluate.evaluate(value, values, 'system_const'))
+
+
+def test_two_arguments():
+    # the regex evaluation split MAX(a, b) at the comma and failed
+    with pytest.raises(TypeError):
+        regex_evaluate.evaluate("<VF>MAX(3, 5)</VF>", VALUES, 'system_const')
+    assert helper.evaluate("<VF>MAX(3, 5)</VF>", VALUES, 'system_const') == 5
+    assert helper.evaluate(f"<VF>MIN({_ref('A')}, {_ref('B')})</VF>", VALUES,
+                           'system_const') == 2
+    assert helper.evaluate("<VF>divide(7, 2)</VF>", VALUES, 'system_const') == 3
+
+
+def test_invalid():
+    # leading zeros inside an expression are not python literals
+    with pytest.raises(SyntaxError):
+        regex_evaluate.evaluate("<VF>017 + 1</VF>", VALUES, 'system_const')
+    with pytest.raises(SyntaxError):
+        helper.evaluate("<VF>017 + 1</VF>", VALUES, 'system_const')
+    # python builtins are not reachable from an expression
+    with pytest.raises(SyntaxError):
+        helper.evaluate("<VF>len(1)</VF>", VALUES, 'system_const')
+    with pytest.raises(NameError):
+        helper.evaluate("<VF>open</VF>", VALUES, 'system_const')
+    resolved, unresolved = helper.resolve_all({"X": f"<VF>{_ref('Y')} + 1</VF>",
+                                               "Y": f"<VF>{_ref('X')}</VF>",
+                                               "W": f"<VF>{_ref('Q')}</VF>"})
+    assert resolved == {}
+    assert sorted(unresolved) == ["W", "X", "Y"]
@@ -0,0 +1,43 @@
+"""
+Records of the *_pavast.xml files.
+"""
+import random
+
+from synthetic_pver import pavast_file
+from tools import pavast_index
+
+
+def _fields(record):
+    return [getattr(record, name) for name in pavast_index.PavastRecord.__slots__
+            if name != "path"]
+
+
+def test_scan_prolog(tmp_path):
+    content = pavast_file(1, 2, 5, 3, random.Random(0))
+    declaration, _, body = content.partition('\n')
+    plain = tmp_path / "plain_pavast.xml"
+    plain.write_text(content, encoding='ISO-8859-1')
+    prolog = tmp_path / "prolog_pavast.xml"
+    prolog.write_text('\n'.join([declaration, "<!-- generated -->",
+                                 '<?xml-stylesheet type="text/xsl" href="msrsw.xsl"?>', body]),
+                      encoding='ISO-8859-1')
+    record = pavast_index.scan(str(prolog))
+    assert record.elements and record.constants
+    assert _fields(record) == _fields(pavast_index.scan(str(plain)))
+
+
+def test_update_workers(tmp_path):
+    rnd = random.Random(0)
+    paths = []
+    for index in range(8):
+        path = tmp_path / f"c{index}_pavast.xml"
+        path.write_text(pavast_file(index, 8, 20, 10, rnd), encoding='ISO-8859-1')
+        paths.append(str(path))
+    serial = pavast_index.PavastIndex()
+    assert serial.update(paths) == len(paths)
+    parallel = pavast_index.PavastIndex()
+    assert parallel.update(paths, workers=2) == len(paths)
+    assert list(parallel.records) == list(serial.records)
+    assert parallel.stamps == serial.stamps
+    for key, record in serial.records.items():
+        assert _fields(parallel.records[key]) == _fields(record)
@@ -0,0 +1,56 @@
+"""
+Check states of the lazy PVER tree and the artifacts selected for the tools.
+"""
+from PySide6.QtCore import Qt
+
+from utilities import profiler, watcher
+from utilities.artifact_table import ArtifactTable
+from widgets.pver_model import PverTreeModel
+from widgets.pver_widget import PVERTreeWidget
+
+# Fc_A -> Fc_B_pavast, no mandatory artifact
+RELATIONS = {1: [2], 2: [3]}
+DETAILS = {2: ("FC", "Fc_A", "1", "X", None, None, None, None, None),
+           3: ("TDATA", "Fc_B_pavast", "1", "X", "Fc_B_pavast", "/p", "xml", 1, None)}
+
+
+def _widget(tmp_path, monkeypatch):
+    # the build_tree profile is written under PATH
+    monkeypatch.setattr(profiler, "PATH", str(tmp_path))
+    monkeypatch.setattr(watcher, "ENABLED", False)
+    widget = PVERTreeWidget()
+    widget.base_path = str(tmp_path)
+    widget.build_tree(True, ArtifactTable.from_rows(RELATIONS, DETAILS), [])
+    return widget
+
+
+def _selected(widget):
+    table = widget.pver_model.table
+    return [table.name[node.artifact] for node in widget.selected_damos_artifacts]
+
+
+def test_load_without_mandatory(qapp):
+    model = PverTreeModel()
+    model.load(ArtifactTable.from_rows(RELATIONS, DETAILS))
+    assert model.rowCount() == 1
+    assert model.data(model.index(0, 0)) == "Fc_A"
+
+
+def test_check_collapsed_parent(qapp, tmp_path, monkeypatch):
+    widget = _widget(tmp_path, monkeypatch)
+    model = widget.pver_model
+    parent = model.children(model.root)[0]
+    assert parent.children is None
+    model.set_check_state(parent, Qt.Checked)
+    assert _selected(widget) == ["Fc_B_pavast"]
+
+
+def test_check_expanded_parent(qapp, tmp_path, monkeypatch):
+    widget = _widget(tmp_path, monkeypatch)
+    model = widget.pver_model
+    parent = model.children(model.root)[0]
+    model.fetchMore(model.index(0, 0))
+    model.set_check_state(parent, Qt.Checked)
+    assert _selected(widget) == ["Fc_B_pavast"]
+    model.set_check_state(parent, Qt.Unchecked)
+    assert _selected(widget) == []
@@ -0,0 +1,78 @@
+"""
+Single pass over an arxml document collecting the paths used by BCT and RTEGEN.
+The SHORT-NAMEs of the open elements are kept on a stack while the document is walked,
+the path of an element is known when it ends instead of being searched in its ancestors.
+Tags are compared by local name, the namespace of the document does not matter.
+"""
+from collections import namedtuple
+
+from lxml import etree
+
+COMPONENT_TYPES = ["APPLICATION-SW-COMPONENT-TYPE", "ATOMIC-SW-COMPONENT-TYPE",
+                   "COMPLEX-DEVICE-DRIVER-SW-COMPONENT-TYPE", "ECU-ABSTRACTION-SW-COMPONENT-TYPE",
+                   "NV-BLOCK-SW-COMPONENT-TYPE", "SENSOR-ACTUATOR-SW-COMPONENT-TYPE",
+                   "SERVICE-PROXY-SW-COMPONENT-TYPE", "SERVICE-SW-COMPONENT-TYPE"]
+
+# paths found in a document, in document order:
+#   components: (component type, path) of the SW component types
+#   module_defs: paths of the ECUC-MODULE-DEF elements
+#   definition_refs: ECUC-MODULE-DEF references of the module configurations
+ArxmlScan = namedtuple("ArxmlScan", ["components", "module_defs", "definition_refs"])
+
+_TARGETS = set(COMPONENT_TYPES) | {"ECUC-MODULE-DEF"}
+
+
+def scan_file(path: str) -> ArxmlScan:
+    """
+    Scan a document while it is parsed from the file, the elements are dropped once they
+    are scanned so that only the open elements are kept in memory.
+    """
+    with open(path, 'rb') as file:
+        return _scan(etree.iterparse(file, events=("start", "end")), release=True)
+
+
+def scan_tree(root) -> ArxmlScan:
+    """
+    Scan a parsed document (or a part of it).
+    """
+    return _scan(etree.iterwalk(root, events=("start", "end")))
+
+
+def _scan(events, release: bool = False) -> ArxmlScan:
+    components, module_defs, definition_refs = [], [], []
+    # per open element: its local name and the SHORT-NAMEs of its children
+    tags, names = [], []
+    for event, element in events:
+        if not isinstance(element.tag, str):
+            # comments and processing instructions
+            continue
+        tag = element.tag.rpartition('}')[2]
+        if event == "start":
+            tags.append(tag)
+            names.append([])
+            continue
+
+        tags.pop()
+        short_names = names.pop()
+        if tag == "SHORT-NAME":
+            if names:
+                names[-1].append(element.text)
+        elif tag in _TARGETS and short_names:
+            path = "/".join([""] + [name for frame in names for name in frame] + short_names)
+            if tag == "ECUC-MODULE-DEF":
+                module_defs.append(path)
+            else:
+                components.append((tag, path))
+        elif tag == "DEFINITION-REF" and tags and tags[-1] == "ECUC-MODULE-CONFIGURATION-VALUES" \
+                and element.get("DEST") == "ECUC-MODULE-DEF":
+            definition_refs.append(element.text)
+        if release and tag != "SHORT-NAME":
+            # the element and its scanned siblings are no longer needed,
+            # a SHORT-NAME goes with its parent
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            # the root has no parent, its siblings are the comments and PIs of the document
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+    return ArxmlScan(components, module_defs, definition_refs)
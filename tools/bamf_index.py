@@ -0,0 +1,176 @@
+"""
+Reverse index of the .bamf files of a PVER: ECUC-DEFINITION-REF -> BUILD-ACTION SHORT-NAME.
+Every file is read once and summarised in a BamfRecord; the BCT actions of a change are then
+selected with set lookups instead of parsing the modified .bamf files again.
+"""
+import os
+import pickle
+from typing import Dict, Iterable, List
+
+from lxml import etree
+
+# version of the records stored on disk, increase it when BamfRecord changes
+INDEX_VERSION = 1
+INDEX_FILE = 'bamf_index.pkl'
+
+
+class BamfRecord:
+    """
+    Summary of a single .bamf file, only the build actions creating an ARTIFACT are kept.
+        actions: names of the actions, in the order of the file.
+        references: ECUC-DEFINITION-REF of the inputs -> names of the actions reading it.
+    """
+    __slots__ = ("actions", "references")
+
+    def __init__(self, actions: List, references: Dict[str, List]):
+        self.actions = actions
+        self.references = references
+
+
+def scan(path: str) -> BamfRecord:
+    """
+    Read the build actions of a .bamf file.
+    """
+    actions = {}
+    references = {}
+    root = etree.parse(path).getroot()
+    for action in root.iterfind(".//{*}BUILD-ACTION"):
+        if not any(category.text == 'ARTIFACT' for category in action.iterfind(
+                './{*}CREATED-DATAS/{*}BUILD-ACTION-IO-ELEMENT/{*}CATEGORY')):
+            continue
+        name = action.find('./{*}SHORT-NAME').text
+        actions.setdefault(name)
+        for ecu_def in action.iterfind(
+                './/{*}INPUT-DATAS/{*}BUILD-ACTION-IO-ELEMENT/{*}ECUC-DEFINITION-REF'):
+            names = references.setdefault(ecu_def.text, [])
+            if name not in names:
+                names.append(name)
+    return BamfRecord(list(actions), references)
+
+
+class BamfIndex:
+    """
+    Records of the .bamf files of a PVER and the reverse index over all of them:
+        ECUC-DEFINITION-REF -> [(file, action)]
+    """
+
+    def __init__(self, paths: List = None):
+        self.records = {}
+        self.stamps = {}
+        self._reverse = None
+        if paths:
+            self.update(paths)
+
+    @staticmethod
+    def key(path: str) -> str:
+        """
+        Key of a path in the index.
+        """
+        return os.path.normpath(path)
+
+    def update(self, paths: Iterable) -> int:
+        """
+        Read every path which is not indexed yet or whose size or mtime changed.
+        Return the number of files read.
+        """
+        read = 0
+        for path in paths:
+            key = self.key(path)
+            if not os.path.exists(key):
+                continue
+            stat = os.stat(key)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            if key not in self.records or self.stamps.get(key) != stamp:
+                self.records[key] = scan(key)
+                self.stamps[key] = stamp
+                self._reverse = None
+                read += 1
+        return read
+
+    def record(self, path: str) -> BamfRecord:
+        """
+        Return the record of the path, reading the file on first access.
+        """
+        key = self.key(path)
+        record = self.records.get(key)
+        if record is None:
+            record = self.records[key] = scan(key)
+            self._reverse = None
+        return record
+
+    def discard(self, path: str):
+        """
+        Forget the record of a path, it will be read again on next access.
+        """
+        key = self.key(path)
+        self.records.pop(key, None)
+        self.stamps.pop(key, None)
+        self._reverse = None
+
+    @property
+    def reverse(self) -> Dict[str, List]:
+        """
+        ECUC-DEFINITION-REF -> [(file key, action)] over all the indexed files
+        """
+        if self._reverse is None:
+            reverse = {}
+            for key, record in self.records.items():
+                for reference, names in record.references.items():
+                    reverse.setdefault(reference, []).extend((key, name) for name in names)
+            self._reverse = reverse
+        return self._reverse
+
+    def actions(self, modified_paths: List, bamf_paths: List, arxml_arguments: Iterable) -> List:
+        """
+        Build actions of a change:
+            every action of the modified files which are in bamf_paths
+            the actions of the other modified files reading one of arxml_arguments
+        """
+        modified_paths = [path.replace('\\', '/') for path in modified_paths]
+        self.update(modified_paths)
+        action_to_run = {}
+        others = set()
+        for path in modified_paths:
+            record = self.record(path)
+            if path in bamf_paths:
+                action_to_run.update(dict.fromkeys(record.actions))
+            else:
+                others.add(self.key(path))
+        if others:
+            reverse = self.reverse
+            for argument in set(arxml_arguments):
+                for key, name in reverse.get(argument, ()):
+                    if key in others:
+                        action_to_run.setdefault(name)
+        return list(action_to_run)
+
+    def save(self, path: str):
+        """
+        Store the index on disk: a version header followed by the records.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump({"version": INDEX_VERSION}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump((self.records, self.stamps), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BamfIndex':
+        """
+        Load an index stored by save(), an empty index is returned if the file is missing,
+        unreadable or written by another version.
+        """
+        index = cls()
+        if not os.path.isfile(path):
+            return index
+        try:
+            with open(path, 'rb') as file:
+                header = pickle.load(file)
+                if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+                    return index
+                index.records, index.stamps = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                TypeError, ValueError):
+            return cls()
+        return index
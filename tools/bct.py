@@ -3,11 +3,15 @@ TODO:
 """
 import os
 import re
-from typing import List
-from collections import deque
+import threading
+from typing import Dict, List
 from lxml import etree
 from PySide6.QtCore import QObject, Signal
+from tools import arxml_scanner, bamf_index
+from tools.bamf_index import BamfIndex
+from utilities import fs_index
 from utilities.log import get_logger
+from utilities.ordering import OrderedRegistry
 
 logger = get_logger(__name__)
 
@@ -91,268 +95,268 @@ def is_runable(path):
     return ' -bsw rebuild -l '
 
 
-def get_all_bfw_actions(root, action):
+def get_pm_actions(root) -> Dict[str, str]:
     """
-    take all the actions existed in the buildframework.cfg file (bfw)
+    .pm file name -> description of the actions it runs, from buildframework-roles.cfg
     """
-    original_action = [actions.attrib['id']
-                       for actions in root.findall('.//{*}' + action)]
-    return original_action
-
-
-def get_pm_actions(path, pm_paths):
-    """
-    Check inside the buildframework-roles.cfg to list all [.pm] files
-    """
-    tree = etree.parse(path)
-    root = tree.getroot()
-    pm_files = {}
     pm_actions = {}
-
-    for pm_path in pm_paths:
-        pm_files[pm_path.split('/')[-1]] = pm_path
-
     for ecu_out_pm in root.findall('.//{*}property/[@value="pm"]...'):
         if (ecu_out_pm.find('.//{*}property/[@name="filter"]')) is not None:
             pm_actions[ecu_out_pm.find('./{*}property/[@name="filter"]')
                            .attrib['value'] + '.pm'] = \
                 ecu_out_pm.find('./{*}description').text.split("'")[1]
-    return pm_files, pm_actions
-
+    return pm_actions
+
+
+class BuildFrameworkGraph:
+    """
+    Dependencies between the actions of the build framework (buildframework.cfg and
+    buildframework-roles.cfg), parsed once per version of the cfg files:
+        actions : ids of the actions in the order of buildframework.cfg
+        adjacency : action -> actions creating its ECUC inputs, then its predecessors
+        predecessors : action -> actions which must run before it
+        pm_actions : .pm file name -> description of the actions it runs
+    """
+
+    def __init__(self, actions: List, adjacency: Dict[str, List], predecessors: Dict[str, List],
+                 pm_actions: Dict[str, str]):
+        self.actions = actions
+        self.registry = OrderedRegistry(actions)
+        self.adjacency = adjacency
+        self.predecessors = predecessors
+        self.pm_actions = pm_actions
+
+    @classmethod
+    def from_cfg(cls, cfg_path: List) -> 'BuildFrameworkGraph':
+        """
+        Parse buildframework.cfg and buildframework-roles.cfg
+        """
+        root = None
+        pm_actions = {}
+        for path in cfg_path:
+            if 'buildframework.cfg' in path:
+                root = etree.parse(path).getroot()
+            else:
+                pm_actions = get_pm_actions(etree.parse(path).getroot())
 
-def get_cfg_actions(cfg_path, bamf_actions: List, pm_paths: List) -> List:
-    """
-    Recursive function to get all the actions after parsing .bamf files:
+        if root.tag.endswith('buildConfiguration'):
+            action, input_tag, output_tag = 'actionDefinition', 'actionInput', 'actionOutput'
+            io_mapping_tag, io_identify_tag, pred_attrib = 'role', 'id', 'id'
+        else:
+            action, input_tag, output_tag = 'action', 'input', 'output'
+            io_mapping_tag, io_identify_tag, pred_attrib = 'IOMapping', 'roleId', 'name'
+
+        actions = []
+        inputs = {}  # action -> the ECUC roles it consumes
+        creators = {}  # ECUC role -> the action creating it
+        for element in root.findall('.//{*}' + action):
+            actions.append(element.attrib['id'])
+            inputs[element.attrib['id']] = [
+                role.attrib[io_identify_tag] for role in element.findall(
+                    './/{*}' + input_tag + '/[@type="ECUC_IN"]' + '/{*}' + io_mapping_tag)
+                if 'role_ecuc_out' in role.attrib[io_identify_tag]]
+            for role in element.findall('.//{*}' + output_tag + '/{*}' + io_mapping_tag):
+                if 'role_ecuc_out' in role.attrib[io_identify_tag]:
+                    creators[role.attrib[io_identify_tag]] = element.attrib['id']
+
+        predecessors = {}
+        for element in root.findall('.//{*}action'):
+            predecessors[element.attrib['id']] = [predecessor.attrib[pred_attrib] for predecessor
+                                                  in element.findall('.//{*}predecessor')]
+
+        adjacency = {}
+        for name, roles in inputs.items():
+            dependencies = adjacency[name] = []
+            for dependency in [creators[role] for role in roles if role in creators] \
+                    + predecessors.get(name, []):
+                if dependency not in dependencies:
+                    dependencies.append(dependency)
+        return cls(actions, adjacency, predecessors, pm_actions)
+
+    @classmethod
+    def load(cls, cfg_path: List) -> 'BuildFrameworkGraph':
+        """
+        Graph of the cfg files, parsed again only when one of the files changed
+        """
+        stamps = []
+        for path in cfg_path:
+            stat = os.stat(path)
+            stamps.append((os.path.normcase(os.path.abspath(path)),
+                           stat.st_mtime_ns, stat.st_size))
+        key = tuple(stamps)
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = cls.from_cfg(cfg_path)
+            _graphs.clear()
+            _graphs[key] = graph
+        return graph
+
+    def order(self, actions) -> List:
+        """
+        Actions in the order of buildframework.cfg, after their predecessors
+        """
+        return self.registry.topological_sort(actions, self.predecessors)
+
+    def pm_dependencies(self, action: str, dependencies: List, pm_files: Dict,
+                        parsed: Dict = None) -> List:
+        """
+        Actions run by the .pm file of the action which are listed in the same pm role,
+        added to dependencies (the actions already known for the action).
+        The .pm files are read through the cache of the unchanged files.
+        """
+        parsed = {} if parsed is None else parsed
+        for pm_action in self.pm_actions.values():
+            if action in pm_action and action not in dependencies \
+                    and action + '.pm' in pm_files:
+                pm_path = pm_files[action + '.pm']
+                if pm_path not in parsed:
+                    parsed[pm_path] = _pm_cache.actions(pm_path)
+                for add_action in parsed[pm_path]:
+                    if add_action in pm_action and action not in dependencies:
+                        dependencies.append(add_action)
+        return dependencies
+
+    def closure(self, seeds, pm_files: Dict) -> set:
+        """
+        The seed actions and every action they depend on, directly or not,
+        in one traversal of the graph
+        """
+        parsed = {}
+        result = set(seeds)
+        stack = list(result)
+        while stack:
+            action = stack.pop()
+            if action not in self.adjacency:
+                continue
+            for dependency in self.pm_dependencies(action, list(self.adjacency[action]),
+                                                   pm_files, parsed):
+                if dependency not in result:
+                    result.add(dependency)
+                    stack.append(dependency)
+        return result
+
+
+# graph of the last cfg files, see BuildFrameworkGraph.load()
+_graphs = {}
+
+
+def get_cfg_actions(cfg_path, bamf_actions: List, pm_paths: List) -> set:
+    """
+    Get all the actions to run for the actions found in the .bamf files:
     parameters:
         cfg_path : including buildframework.cfg and buildframework-roles.cfg type of files
         bamf_actions: all the actions have stored from bamf files
         pm_paths: all the path have stored from PVER directory`
     """
-    global BFW_ACTIONS
-    global INPUT_LIST
-    global OUTPUT_LIST
-    global PREDECESSOR_LIST
-
-    for path in cfg_path:
-        if 'buildframework.cfg' in path:
-            tree = etree.parse(path)
-            root = tree.getroot()
-            if root.tag.endswith('buildConfiguration'):
-                action = 'actionDefinition'
-                input_tag = 'actionInput'
-                output_tag = 'actionOutput'
-                io_mapping_tag = 'role'
-                io_identify_tag = 'id'
-                pred_attrib = 'id'
-            else:
-                action = 'action'
-                input_tag = 'input'
-                output_tag = 'output'
-                io_mapping_tag = 'IOMapping'
-                io_identify_tag = 'roleId'
-                pred_attrib = 'name'
-        else:
-            pm_files, pm_actions = get_pm_actions(path, pm_paths)
-    BFW_ACTIONS = get_all_bfw_actions(root, action)  # all the actions of the bfw are taken in order
-    bamf_actions.sort(key=lambda i: BFW_ACTIONS.index(i)
-    if i in BFW_ACTIONS else len(BFW_ACTIONS) - 1)
-
-    action_queue = deque()
-    action_queue.extend(bamf_actions)
-
-    action_result = set()
-    action_result.update(bamf_actions)
-
-    INPUT_LIST = {}  # all the dependant actions type: [ecu_out_...]
-    OUTPUT_LIST = {}  # actions that creates a dependant action [output_tags]
-    PREDECESSOR_LIST = {}
-
-    for input_action in root.findall('.//{*}' + action):
-        INPUT_LIST[input_action.attrib['id']] = [inputs.attrib[io_identify_tag] for inputs in
-                                                 input_action.findall(
-                                                     './/{*}' + input_tag + '/[@type="ECUC_IN"]' + '/{*}' + io_mapping_tag)
-                                                 if 'role_ecuc_out' in inputs.attrib[io_identify_tag]]
-
-        for created_action in [outputs.attrib[io_identify_tag] for outputs in
-                               input_action.findall('.//{*}' + output_tag + '/{*}' + io_mapping_tag) if
-                               'role_ecuc_out' in outputs.attrib[io_identify_tag]]:
-            OUTPUT_LIST[created_action] = input_action.attrib['id']
-
-    for dependant_action in root.findall('.//{*}action'):
-        PREDECESSOR_LIST[dependant_action.attrib['id']] = \
-            [pred_action.attrib[pred_attrib] for pred_action in
-             dependant_action.findall('.//{*}predecessor')]
-    current_dependant_list = []
-    current_pm_list = []
-    while action_queue:
-        action = action_queue.pop()
-        # if action in action_result:
-        #     continue
-        dependence_actions = get_action_dependencies(action, current_dependant_list,
-                                                     pm_files, pm_actions)
-        # dependence_actions.extend(get_action_in_pm(action, current_pm_list))
-        for each_action in dependence_actions:
-            if each_action not in action_queue and each_action not in action_result:
-                action_result.add(each_action)
-                action_queue.append(each_action)
-        current_dependant_list.clear()
-        current_pm_list.clear()
-
-    return action_result
-
-
-def get_action_dependencies(action, dependencies, pm_files, pm_actions):
-    """
-    get all the dependencies of the action in .cfg files
-    """
-    global BFW_ACTIONS
-    global INPUT_LIST
-    global OUTPUT_LIST
-    global PREDECESSOR_LIST
-
-    if action in BFW_ACTIONS and action not in dependencies:
-        for ecu_out in INPUT_LIST[action]:
-            if (OUTPUT_LIST[ecu_out] not in dependencies):
-                dependencies.append(OUTPUT_LIST[ecu_out])
-                get_action_dependencies(OUTPUT_LIST[ecu_out], dependencies, pm_files, pm_actions)
-
-        for predecessor in PREDECESSOR_LIST[action]:
-            if (predecessor not in dependencies):
-                dependencies.append(predecessor)
-                get_action_dependencies(predecessor, dependencies, pm_files, pm_actions)
-        dependencies.extend(get_action_in_pm(action, dependencies, pm_files, pm_actions))
-    return dependencies
-
-
-def get_action_in_pm(action, dependencies, pm_files, pm_actions):
-    """
-    get all the dependencies of the action in .pm file
-    """
-    for pm_file, pm_action in pm_actions.items():
-        if action in pm_action and action not in dependencies:
-            if str(action + '.pm') in pm_files:
-                add_actions = pm_parse(pm_files[str(action + '.pm')])
-                if add_actions is not None:
-                    for add_action in add_actions:
-                        if add_action in pm_action and action not in dependencies:
-                            dependencies.append(add_action)
-                            get_action_in_pm(add_action, dependencies, pm_files, pm_actions)
-    return dependencies
-
-
-def pm_parse(pm_path):
+    pm_files = {pm_path.split('/')[-1]: pm_path for pm_path in pm_paths}
+    return BuildFrameworkGraph.load(cfg_path).closure(bamf_actions, pm_files)
+
+
+def pm_parse(pm_path) -> List:
     """
-    search line by line to take all the necessary action.
+    Actions called in a .pm file ("<action>::" or "<action>_process::"), read line by line.
+    Comment lines are skipped.
     """
-    if (os.path.exists(pm_path)):
-        all_lines = []
-        pm_list = []
-        with open(pm_path, 'r', encoding='utf-8') as file:
-            all_lines += all_lines + (file.readlines())
-            file.close()
-        search_lines = [line.strip() for line in all_lines if
-                        ("::" in line and "conf_process" not in line and ~line.startswith('#'))]
-        for line in search_lines:
-            line = line.split("::")[0].split()[-1]
-            line = re.findall(r'\w+', line)
-            if line[-1] not in pm_list:
-                pm_list.append(line[-1])
-
-            if '_process' in line[-1]:
-                line[-1] = line[-1].replace('_process', '')
-                if line[-1] not in pm_list:
-                    pm_list.append(line[-1])
-    return pm_list
+    if not os.path.exists(pm_path):
+        return []
+    pm_list = {}
+    with open(pm_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if "::" not in line or "conf_process" in line or line.startswith('#'):
+                continue
+            words = line.split("::")[0].split()
+            names = re.findall(r'\w+', words[-1]) if words else []
+            if not names:
+                continue
+            pm_list.setdefault(names[-1])
+            if '_process' in names[-1]:
+                pm_list.setdefault(names[-1].replace('_process', ''))
+    return list(pm_list)
+
+
+class PmActionCache:
+    """
+    Actions of the .pm files keyed by path and validated with (mtime, size),
+    a file is parsed again only when it changed.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def actions(self, pm_path) -> List:
+        """
+        Actions called in the .pm file, see pm_parse()
+        """
+        try:
+            stat = os.stat(pm_path)
+        except OSError:
+            return []
+        key = os.path.normcase(os.path.abspath(pm_path))
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None or entry[0] != stamp:
+            entry = (stamp, pm_parse(pm_path))
+            with self._lock:
+                self.entries[key] = entry
+        return entry[1]
+
+
+# actions of the .pm files reached by the graph, kept for the later builds
+_pm_cache = PmActionCache()
 
 
 def get_arguments_arxml(arxml_path):
     """
-    Get the arguments of the arxml file if have in modified PVER.
+    Get the arguments of the arxml file if have in modified PVER:
+    the paths of its ECUC module definitions, then the module definitions it configures.
     """
-    arguments = []
-    tree = etree.parse(arxml_path)
-    root_node = tree.getroot()
-    elements = root_node.findall(".//ECUC-MODULE-DEF")
-    if len(elements) > 0:
-        for element in elements:
-            if element.find('.//{*}SHORT-NAME'):
-                arg_path = []
-                for ancestor in element.xpath('ancestor-or-self::*[.//SHORT-NAME]'):
-                    children = ancestor.getchildren()
-                    for child in children:
-                        # Only get short name if it is of actual ancestor of the SWC.
-                        if child.tag == "SHORT-NAME":
-                            arg_path.append(child.text)
-                            if ancestor.tag == "ECUC-MODULE-DEF":
-                                arguments.append(str.join("/", arg_path))
-    return arguments
-
-
-def bamf_parser(modified_paths, bamf_paths, arxml_arguments) -> List:
+    scan = arxml_scanner.scan_file(arxml_path)
+    return scan.module_defs + scan.definition_refs
+
+
+def bamf_parser(modified_paths, bamf_paths, arxml_arguments, index: BamfIndex = None) -> List:
     """
-    parse inside the .bamf files to get action to run
+    get the actions to run from the .bamf files
     :param modified_paths: contain all the path of the current change in PVER
     :param bamf_paths: contains all the bamf files
+    :param index: reverse index of the .bamf files, the unchanged files are not read again
     """
-    action_to_run = []
-    for fpath in modified_paths:
-        fpath = fpath.replace('\\', '/')
-        tree = etree.parse(fpath)
-        root = tree.getroot()
+    index = index or BamfIndex()
+    return index.actions(modified_paths, bamf_paths, arxml_arguments)
 
-        for action in root.iterfind(".//{*}BUILD-ACTION"):
-            for artifacts in action.iterfind(
-                    './{*}CREATED-DATAS/{*}BUILD-ACTION-IO-ELEMENT/{*}CATEGORY'):
-                if artifacts.text == 'ARTIFACT':
-                    if fpath in bamf_paths:
-                        add_action = action.find('./{*}SHORT-NAME').text
-                        if add_action not in action_to_run:
-                            action_to_run.append(action.find('./{*}SHORT-NAME').text)
-                    else:
-                        for ecu_ref in action.iterfind(
-                                './/{*}INPUT-DATAS/{*}BUILD-ACTION-IO-ELEMENT'):
-                            for ecu_def in ecu_ref.iterfind('./{*}ECUC-DEFINITION-REF'):
-                                if ecu_def.text in arxml_arguments:
-                                    action_to_run.append(action.find('./{*}SHORT-NAME').text)
-    return action_to_run
-
-
-def get_arguments(modified_paths, bamf_paths, arxml_paths, cfg_path, pm_paths) -> List:
+
+def get_arguments(modified_paths, bamf_paths, arxml_paths, cfg_path, pm_paths,
+                  bamf_index: BamfIndex = None) -> List:
     """
     get all the actions to run the BTC tools
     :param modified_paths: contain all the path of the current change in PVER
     :param bamf_paths: contains all the bamf files
+    :param bamf_index: reverse index of the .bamf files of the PVER
     """
-    global BFW_ACTIONS
     arxml_arguments = []
 
     for fpath in arxml_paths:
-
-        tree = etree.parse(fpath)
-        root = tree.getroot()
-
-        if '.arxml' in arxml_paths:
-            for argument in get_arguments_arxml(arxml_paths):
-                arxml_arguments.append(argument)
-            for msrelem in root.findall(
-                    ".//{*}ECUC-MODULE-CONFIGURATION-VALUES/{*}DEFINITION-REF/[@DEST='ECUC-MODULE-DEF']"):
-                arxml_arguments.append(msrelem.text)
+        if fpath.endswith('.arxml'):
+            arxml_arguments.extend(get_arguments_arxml(fpath))
         else:
+            root = etree.parse(fpath).getroot()
             for msrelem in root.findall(
                     './/{*}SW-SYSTEM/{*}CONF-SPEC/{*}CONF-ITEMS/{*}CONF-ITEM/{*}SHORT-NAME'):
                 arxml_arguments.append('/MEDC17/' + msrelem.text)
 
-    action_to_run = bamf_parser(modified_paths, bamf_paths, arxml_arguments)
+    action_to_run = bamf_parser(modified_paths, bamf_paths, arxml_arguments, bamf_index)
     action_to_run.append('Setup')
     action_to_run.append('BctStart')
 
     if len(action_to_run) != 2:
-        arguments = get_cfg_actions(cfg_path, action_to_run, pm_paths)
-        args = list(arguments)
-        args.sort(key=lambda i: BFW_ACTIONS.index(i) if i in BFW_ACTIONS else len(BFW_ACTIONS) - 1)
-        logger.info(f"Total number of actions available: {len(BFW_ACTIONS)}")
+        graph = BuildFrameworkGraph.load(cfg_path)
+        args = graph.order(get_cfg_actions(cfg_path, action_to_run, pm_paths))
+        logger.info(f"Total number of actions available: {len(graph.actions)}")
         logger.info(f"Number of actions to run for the current changes: {len(args)}")
-        if len(args) / len(BFW_ACTIONS) > 7:
+        if len(args) / len(graph.actions) > 7:
             logger.info(
                 "Almost more than 70% of the actions need to run for the current changes. "
                 "It is recommended to run complete BCT instead of this selective build")
@@ -375,7 +379,16 @@ def get_command(modified_paths, bamf_paths, arxml_paths, cfg_path, pm_paths) ->
         return None, env
     tool = is_runable(PATH)
 
-    arguments = get_arguments(modified_paths, bamf_paths, arxml_paths, cfg_path, pm_paths)
+    # reverse index of all the .bamf files of the PVER, only the changed files are read again
+    index_path = os.path.join(WORKING_PATH, '_smb', 'bct', bamf_index.INDEX_FILE)
+    index = BamfIndex.load(index_path)
+    refreshed = index.update(fs_index.get(WORKING_PATH).glob('*.bamf'))
+    arguments = get_arguments(modified_paths, bamf_paths, arxml_paths, cfg_path, pm_paths, index)
+    try:
+        index.save(index_path)
+    except OSError as exception:
+        logger.warning(f"BCT :: bamf index not saved: {exception}")
+    logger.info(f"BCT :: bamf index {refreshed} files re-read")
 
     saving_path = os.path.normpath(SAVING_PATH + '\\bct')
     if not os.path.isdir(saving_path):
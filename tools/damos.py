@@ -1,18 +1,24 @@
 """
 DOCSTRING: Damos run tools
 """
+import copy
 import os.path
 import pathlib
 import re
 import warnings
+from tools import doc_cache
 from tools import helper
 from tools import numbers
+from tools import pavast_index
+from tools.pavast_index import PavastIndex
+from tools.reference_graph import ReferenceGraph
 from typing import List, Dict
 from lxml import etree
 from PySide6.QtCore import QObject, Signal
 
-# from utilities.log import get_logger
-# logger = get_logger(__name__)
+from utilities.log import get_logger
+from utilities.ordering import OrderedRegistry
+logger = get_logger(__name__)
 
 
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -61,6 +67,22 @@ def tini_sync(dictionary):
 tini_signal = SyncInit()
 tini_signal.sync.connect(tini_sync)
 
+def workers_setting(value) -> int:
+    """
+    Number of processes set by the DAMOS_WORKERS environment variable, 0 if it is not a number.
+    """
+    if not value:
+        return 0
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning(f"DAMOS_WORKERS={value} is not a number, the pavast files are read serially")
+        return 0
+
+# number of processes reading the changed *_pavast.xml files, 0 or 1 reads them in the
+# calling thread. Set DAMOS_WORKERS in the environment of the GUI to enable the process pool.
+WORKERS = workers_setting(os.environ.get("DAMOS_WORKERS"))
+
 def is_required(item_class, item_name):
     """
     Check if the items is required for the DAMOS tools.
@@ -73,151 +95,97 @@ def is_required(item_class, item_name):
 SECTION: --> Creating the new *_pavast.xml to add in the --optionfile switch.
          --> Add the service fucntions contain all the variables which is wrote in another task.
 """
-def extract_system_constant(all_pavast_paths):
+def extract_system_constant(all_pavast_paths, index: PavastIndex = None):
     """
     find all the owned and exported system constant in *_pavast.xml files.
     """
-    sc_list = []
+    index = index or PavastIndex()
     sc_dict = {}
     for path in all_pavast_paths:
-        tree = etree.parse(path)
-        root = tree.getroot()
-
-        owned_elements = root.findall('.//{*}SW-FEATURE-OWNED-ELEMENTS//{*}SW-SYSTEMCONST-REF')
-        if len(owned_elements)>0:
-            for element in owned_elements:
-                if element.text not in sc_list:
-                    sc_list.append(element.text)
-
-        export_elements = root.findall('.//{*}SW-INTERFACE-EXPORT//{*}SW-SYSTEMCONST-REF')
-        if len(export_elements)>0:
-            for element in export_elements:
-                if element.text not in sc_list:
-                    sc_list.append(element.text)
-        sc_dict[path] = sc_list
-        sc_list = []
-
-    for path in all_pavast_paths:
-        if len(sc_dict[path])<=0:
-            del sc_dict[path]
+        sc_list = index.record(path).systemconsts
+        if len(sc_list) > 0:
+            sc_dict[path] = list(sc_list)
     return sc_dict
 
-def get_unresolved_value(sc_dict: Dict):
+def get_unresolved_value(sc_dict: Dict, index: PavastIndex = None):
     """
     for the founded system constants --> find its value in [V,VF,VT] tags
     """
+    index = index or PavastIndex()
     values_dict = {}
     for path, var_list in sc_dict.items():
-        tree = etree.parse(path)
-        root = tree.getroot()
-        sc_list = root.findall('.//SW-DATA-DICTIONARY-SPEC//{*}SW-SYSTEMCONST')
-        for sc in sc_list:
-            if len(sc)>0:
-                sc_name = sc.find('.//{*}SHORT-NAME').text
-                if sc_name in var_list:
-                    for tag in helper.values_tag:
-                        val = sc.find('.//{*}'+f'{tag}')
-                        if val is not None:
-                            value_str = re.sub(r"[\t\n]*","",etree.tostring(val, pretty_print=True).decode().strip())
-                            values_dict[sc_name] = value_str
+        for sc_name, value_str in index.record(path).constants:
+            if sc_name in var_list and value_str is not None:
+                values_dict[sc_name] = value_str
     return values_dict
 
-def syscond_resolve(all_pavast_paths: List, sc_values: Dict):
+def syscond_resolve(all_pavast_paths: List, sc_values: Dict, index: PavastIndex = None):
     """
     Resolve values objects.
-    resolve the system condition. Return True or False.
+    resolve the system condition of every *-REF-SYSCOND element. Return True or False.
+    Identical conditions are evaluated once, the last occurrence of an element wins.
+    return:
+        syscond_dict: element -> condition
+        errors: element -> reason, for the conditions which could not be evaluated.
     """
-    syscond_elements = []
+    index = index or PavastIndex()
     syscond_dict = {}
-    syscond_tags = ['SW-SYSTEMCONST-REF-SYSCOND',
-                      'SW-VARIABLE-REF-SYSCOND',
-                      'SW-SERVICE-REF-SYSCOND',
-                      'SW-CLASS-REF-SYSCOND',]
+    errors = {}
+    evaluated = {}
 
     for path in all_pavast_paths:
-        tree = etree.parse(path)
-        root = tree.getroot()
+        for tag, syscond_name, val_str in index.record(path).sysconds:
+            if syscond_name is None or val_str is None:
+                missing = tag.replace("-SYSCOND", "") if syscond_name is None else 'SW-SYSCOND'
+                errors[syscond_name or f"{path}:{tag}"] = f"missing {missing}"
+                continue
 
-        for tag in syscond_tags:
-            syscond_elements.extend(root.findall(f'.//{tag}'))
-
-        if len(syscond_elements)>0:
-            for element in syscond_elements:
+            if val_str not in evaluated:
                 try:
-                    syscond_name  = element.find(f'{element.tag.replace("-SYSCOND","")}').text
-                    condition_str = element.find('SW-SYSCOND')
-                    val_str = re.sub(r"[\t\n]*", "", etree.tostring(condition_str,
-                                            pretty_print=True).decode()).strip()
-
                     value = helper.evaluate(val_str, sc_values, type='syscond')
                     if isinstance(value, numbers.Integral) or isinstance(value, numbers.Real):
-                        if value == 1 :
-                            syscond_dict[syscond_name] = True
-                        else:
-                            syscond_dict[syscond_name] = False
-                    else:
-                        syscond_dict[syscond_name] = value
-                except:
-                    pass
-    return syscond_dict
-
-def extract_elements(path):
+                        value = value == 1
+                    evaluated[val_str] = (value, None)
+                except Exception as error:
+                    evaluated[val_str] = (None, f"{error.__class__.__name__}: {error}")
+
+            value, error = evaluated[val_str]
+            if error is None:
+                syscond_dict[syscond_name] = value
+            else:
+                errors[syscond_name] = error
+    return syscond_dict, errors
+
+def extract_elements(path, index: PavastIndex = None):
     """
     find all elements have been exported or owned by current *_pavast.xml path.
     """
-    reference_tags = ["SW-SYSTEMCONST-REF",
-                      "SW-SERVICE-REF",
-                      "SW-CLASS-REF",
-                      "SW-VARIABLE-REF",
-                      "SW-DATA-CONSTR-REF",
-                      ]
-    elements_list = []
-    tree = etree.parse(path)
-    root = tree.getroot()
-
-    for tag in reference_tags:
-        owned_elements = root.iterfind('.//{*}SW-FEATURE-OWNED-ELEMENTS//SW-FEATURE-ELEMENTS//{*}' + f'{tag}')
-        if owned_elements is not None:
-            for element in owned_elements:
-                if element.text not in elements_list:
-                    elements_list.append(element.text)
+    index = index or PavastIndex()
+    return index.elements(path)
 
-        export_elements = root.iterfind('.//{*}SW-INTERFACE-EXPORT//SW-FEATURE-ELEMENTS//{*}' + f'{tag}')
-        if export_elements is not None:
-            for element in export_elements:
-                if element.text not in elements_list:
-                    elements_list.append(element.text)
-
-    return elements_list
-
-def get_exported_variables(modified_paths: List)->List:
+def get_exported_variables(modified_paths: List, index: PavastIndex = None)->List:
     """
     Parse inside modified *_pavast.xml to extract the elememts have been exported
     Required:
         # elements taken by all the <*-REF>
         # check tag: .//SW-INTERFACE-EXPORT
     """
+    index = index or PavastIndex()
     export_elements = []
 
     for file_path in modified_paths:
         path = os.path.join(PATH, file_path)
         if os.path.exists(path):
-            export_elements.extend(extract_elements(path))
+            export_elements.extend(index.elements(path))
 
     return export_elements
 
-def create_references_dict(all_pavast_paths: List) -> Dict:
+def create_references_dict(all_pavast_paths: List, index: PavastIndex = None) -> Dict:
     """
     Create a references dictionary to get which elements is used in dictionary tag
     """
-    created_data = {}
-    for path in all_pavast_paths:
-        if os.path.exists(path):
-            var_list = extract_elements(path)
-            if var_list is not None:
-                for key in extract_elements(path):
-                    created_data[key] = path
-    return created_data
+    index = index or PavastIndex()
+    return index.owners(all_pavast_paths)
 
 def get_task_references()->(Dict, str):
     """
@@ -229,7 +197,7 @@ def get_task_references()->(Dict, str):
     task_dict = {}
 
     ### Serching the .opt file to file the option switch
-    opt_dir = os.path.join(PATH, r'_gen\swb\module\data\opt')
+    opt_dir = os.path.join(PATH, '_gen', 'swb', 'module', 'data', 'opt')
     opt_path = [os.path.join(opt_dir, path) for path
                 in os.listdir(opt_dir) if '.opt' in path]
     for path in opt_path:
@@ -256,11 +224,12 @@ def get_task_references()->(Dict, str):
         process = [name.text for name in task.findall('.//{*}OS_PROCESS')]
         task_dict[task.find('.//{*}OS_TASKNAME').text] = process
 
+    os.makedirs(os.path.dirname(smb_task_path), exist_ok=True)
     with open(smb_task_path, 'wb') as file:
         tree.write(file, pretty_print=True, method='xml')
     return task_dict, new_os_task_path
 
-def get_accessed_references(all_pavast_paths: List):
+def get_accessed_references(all_pavast_paths: List, index: PavastIndex = None):
     """
     create a references dictionary to define service functions in which
     contained all the written variables
@@ -270,34 +239,13 @@ def get_accessed_references(all_pavast_paths: List):
         --> get all the variables which is wrote.
     return dict {'service_name': list(write_variables)]}
     """
+    index = index or PavastIndex()
     accessed_dict = {}
-    variables = []
-    services = []
     for file_path in all_pavast_paths:
         path = os.path.join(PATH, file_path)
-        tree = etree.parse(path)
-        root = tree.getroot()
-        for service in root.findall('.//{*}SW-SERVICE'):
-            if service.find('.//{*}CATEGORY').text == 'PROCESS':
-                for variable in service.findall('.//{*}SW-ACCESSED-VARIABLE'):
-                    mode = variable.find('.//{*}SW-VARIABLE-USAGE')
-                    if mode is not None:
-                        if mode.text in ['WRITE', 'READWRITE']:
-                            variables.append(etree.tostring(variable,
-                                            pretty_print=True, encoding='utf-8'))
-                for service_ref in service.findall('.//{*}SW-ACCESSED-SERVICE'):
-                    variables.append(etree.tostring(service_ref,
-                                        pretty_print=True, encoding='utf-8'))
-
-                accessed_dict[service.find('.//{*}SHORT-NAME').text] = variables
-                services.append(service.find('.//{*}SHORT-NAME').text)
-                variables = []
-
-    for service in services:
-        if service in accessed_dict.keys():
-            if not accessed_dict[service]:
-                del accessed_dict[service]
-    return accessed_dict
+        for service, variables in index.record(path).services:
+            accessed_dict[service] = list(variables)
+    return {service: variables for service, variables in accessed_dict.items() if variables}
 
 def get_element_name(elements: List):
     element_dict ={}
@@ -310,13 +258,14 @@ def get_element_name(elements: List):
                 element_dict[tree.find('.//{*}SW-SERVICE-REF').text] = element
     return element_dict
 
-def create_service_resources(all_pavast_paths: List, references_list: List)->(Dict, str):
+def create_service_resources(all_pavast_paths: List, references_list: List,
+                             index: PavastIndex = None)->(Dict, str):
     """
     Create: --> new resources for services function.
             --> new Schedule path for smb run tools
     """
     tasks, task_path = get_task_references()
-    accessed_dict = get_accessed_references(all_pavast_paths)
+    accessed_dict = get_accessed_references(all_pavast_paths, index)
 
     service_dict = {}
     new_services = {}
@@ -342,77 +291,28 @@ def create_service_resources(all_pavast_paths: List, references_list: List)->(Di
         temp = []
     return new_services, task_path
 
-def get_original_elements(path: str, export_variables: List, consider_variables: List)->List:
+def get_original_elements(path: str, export_variables: List, consider_variables: List,
+                          index: PavastIndex = None)->List:
 
     """
     find the current reference variables in the modified PVER.
     if variable has been exported --> pass.
     """
-    # parsing elements inside the  .//SW-INTERFACE-IMPORT
-    import_tags = ["SW-SYSTEMCONST-REF",
-                   "SW-VARIABLE-REF",
-                   "SW-SERVICE-REF",
-                   "SW-CLASS-REF",
-                   "SW-SYSTEMCONST-CODED-REF"]
-
-    reference_variables = []
-    if os.path.exists(path):
-        tree = etree.parse(path)
-        root = tree.getroot()
-
-        for tag in import_tags:
-            import_elements = root.findall('.//{*}SW-INTERFACE-IMPORT//{*}' + f'{tag}')
-            if len(import_elements)>0:
-                for element in import_elements:
-                    val = element.text
-                    if val not in export_variables \
-                        and val not in reference_variables \
-                        and val in consider_variables:
-                        reference_variables.append(val)
-    return reference_variables
-
-def get_references(path: str, key: str, export_variable: List)-> List:
+    index = index or PavastIndex()
+    if not os.path.exists(path):
+        return []
+    return index.imported(path, set(export_variables), set(consider_variables))
+
+def get_references(path: str, key: str, export_variable: List,
+                   index: PavastIndex = None)-> List:
     """
     find all the references if a variable has beeb used it when defining itself.
     """
-    variables = []
-    reference_tags = ["SW-VARIABLE-REF",
-                      "SW-SERVICE-REF",
-                      "SW-SYSTEMCONST-REF",
-                      "SW-CLASS-REF",
-                      "SW-COMPU-METHOD-REF",
-                      "SW-DATA-CONSTR-REF",
-                      "SW-SYSTEMCONST-CODED-REF"
-                     ]
-    # Creating a dictionary that contain children tags
-    tree = etree.parse(path)
-    element = tree.find(".//SW-DATA-DICTIONARY-SPEC")
-    for ancestor in element.xpath('*[.//SHORT-NAME]'):
-        children = [x for x in ancestor.getchildren() if x is not None]
-        for child in children:
-            # check if any variables has been referred for this current definition
-            if child.find('.//SHORT-NAME') is not None:
-                if child.find('.//SHORT-NAME').text == key:
-                    for tag in reference_tags:
-                        variables.extend([var.text for var in child.findall(f".//{tag}")
-                            if var is not None and var.text not in export_variable])
-
-            # check -ref variable in VF tag:
-            for vf in child.findall('.//VF'):
-                if vf is not None:
-                    for element in vf.getchildren():
-                        if element is not None:
-                            if element.text not in variables:
-                                variables.append(element.text)
-
-                    if vf.text is not None:
-                        if not re.match("[+-]?([0-9]*[.])?[0-9]+", vf.text.strip()):
-                            if vf.text not in variables:
-                                variables.append(vf.text)
-    return variables
+    index = index or PavastIndex()
+    return index.references(path, key, export_variable)
 
 def get_path_of_element(variables: List, references_dict: Dict,
-                      current_export: List) -> (Dict, List):
+                        current_export: List, index: PavastIndex = None) -> (Dict, List):
     """
     each element has its own definition in dictionary-spec, this function help to find the
     definition of that variables.
@@ -420,32 +320,14 @@ def get_path_of_element(variables: List, references_dict: Dict,
         variables : current variable need to be defined.
         references_dict : refer to which variable has been exported in which paths.
         current_export : List of all variable has been exported in current run.
-
+        index : symbol table of the pavast files.
+    return
+        created_resources: {path: [elements defined in path]}
+        references_list: variables followed by all the elements they refer to.
     """
-    global file_path
-    created_resources = {}
-    path_list = []
-    for _, path in references_dict.items():
-        key = os.path.normpath(path)
-        if key not in created_resources.keys():
-            created_resources[key] = []
-            path_list.append(key)
-    references_list = []
-    references_list.extend(variables)  # this list gonna change its size cuz its references add-in.
-    for variable in references_list:
-        if variable in references_dict.keys():
-            file_path = os.path.normpath(references_dict[variable])
-            if variable not in created_resources[file_path]:
-                created_resources[file_path].append(variable)
-
-        # if the current path contain more references <*-REF>, take it all!
-            references_list.extend([x for x in get_references(file_path,variable,
-                                                              current_export)
-                                    if x not in references_list])
-    for path in path_list:
-        if not created_resources[path]:
-            del created_resources[path]
-    return created_resources, references_list
+    graph = ReferenceGraph(index or PavastIndex(), references_dict, current_export)
+    references_list = graph.closure(variables)
+    return graph.resources(references_list), references_list
 
 def Create_service_function(service_resources: Dict, created_pavast: str) -> Dict:
     """
@@ -669,43 +551,35 @@ def template_file() -> str:
     file.close()
     return file.name
 
-def element_stuffing(created_resources: Dict) -> str:
+def element_stuffing(created_resources: Dict, index: PavastIndex = None) -> str:
     """
     stuff all the founded variables have been defined in to the empty pavast file.
     --> return name of saved file
     """
-
+    index = index or PavastIndex()
     parser = etree.XMLParser(remove_blank_text=False)
     template_tree = etree.parse(template_file(), parser)
     template_root = template_tree.getroot()
-    # Creating a dictionary that contain children tags
     for path, arguments in created_resources.items():
-        tree = etree.parse(path)
-        root = tree.getroot()
-        element = root.find(".//SW-DATA-DICTIONARY-SPEC")
         for key in arguments:
-            for ancestor in element.xpath('*[.//SHORT-NAME]'):
-                children = ancestor.getchildren()
-                if children is not None:
-                    for child in children:
-                        if child.find('.//SHORT-NAME') is not None:
-                            if child.find('.//SHORT-NAME').text == key:
-                                dictionary = template_root.find(f'.//SW-DATA-DICTIONARY-SPEC//{ancestor.tag}')
-                                owned_tag = child.tag + '-REFS'
-                                if dictionary is not None:
-                                    dictionary.append(child)
-                                ownership = template_root.find(
-                                    './/SW-FEATURE-OWNED-ELEMENTS//{*}'+f'{owned_tag}')
-                                if ownership is not None:
-                                    own_element = etree.SubElement(ownership, f"{child.tag}-REF")
-                                    own_element.text = key
-                                    own_element.tail = "\n\t\t\t\t"
-                                export = template_root.find(
-                                    './/SW-INTERFACE-EXPORT//{*}'+f'{owned_tag}')
-                                if export is not None:
-                                    out = etree.SubElement(export, f"{child.tag}-REF")
-                                    out.text = key
-                                    out.tail = "\n\t\t\t\t"
+            for category, child in index.definitions(path, key):
+                dictionary = template_root.find(f'.//SW-DATA-DICTIONARY-SPEC//{category}')
+                owned_tag = child.tag + '-REFS'
+                if dictionary is not None:
+                    # the source tree is shared by the document cache
+                    dictionary.append(copy.deepcopy(child))
+                ownership = template_root.find(
+                    './/SW-FEATURE-OWNED-ELEMENTS//{*}'+f'{owned_tag}')
+                if ownership is not None:
+                    own_element = etree.SubElement(ownership, f"{child.tag}-REF")
+                    own_element.text = key
+                    own_element.tail = "\n\t\t\t\t"
+                export = template_root.find(
+                    './/SW-INTERFACE-EXPORT//{*}'+f'{owned_tag}')
+                if export is not None:
+                    out = etree.SubElement(export, f"{child.tag}-REF")
+                    out.text = key
+                    out.tail = "\n\t\t\t\t"
 
     _output_file = template_tree.find(".//*[@GID='Filename']")
     saved_as = '_smb/damos'+f'/{_output_file.text}'
@@ -733,31 +607,47 @@ def config_task_option(os_path, new_services):
         tree.write(file, pretty_print=True, method='xml')
 
 def new_pavast_file(modified_paths: List=None,
-                    all_pavasts: List=None,)-> (str, Dict):
+                    all_pavasts: List=None,
+                    workers: int=None)-> (str, Dict):
     """
     create a new *_pavast.py file contain modified information.
+    workers: processes reading the changed *_pavast.xml files, WORKERS if None.
     return:
         filename or directory to the created *_pavast.xml file.
     """
     global_all_pavast = [os.path.join(PATH, file_path)
                          for file_path in all_pavasts]
+    doc_cache.documents.reset_stats()
+
+    # Load the symbol table of the previous build, only changed *_pavast.xml are read again
+    index_path = os.path.join(PATH, '_smb/damos', pavast_index.INDEX_FILE)
+    index = PavastIndex.load(index_path)
+    refreshed = index.update(global_all_pavast, pavast_index.workunit_fingerprints(PATH),
+                             workers=WORKERS if workers is None else workers)
+    index.save(index_path)
+    logger.info(f"damos :: pavast index {refreshed} of {len(global_all_pavast)} files re-read")
 
     # Creating the the export dictionary of all *_pavast.xml in PVER folder
-    references = create_references_dict(global_all_pavast)
+    references = create_references_dict(global_all_pavast, index)
 
     # Creating a List of exported elements by current check
-    current_exports = get_exported_variables(modified_paths)
+    current_exports = get_exported_variables(modified_paths, index)
 
     # create a system constant dictionary:
-    sc_dict = extract_system_constant(global_all_pavast)
-    values_dict = get_unresolved_value(sc_dict)
+    sc_dict = extract_system_constant(global_all_pavast, index)
+    values_dict = get_unresolved_value(sc_dict, index)
 
-    # resolve values for all system constants :
-    for name, val_str in values_dict.items():
-        values_dict[name] = helper.evaluate(val_str, values_dict,type='system_const',post_eval=True)
+    # resolve values for all system constants in dependency order:
+    values_dict, unresolved = helper.resolve_all(values_dict, type='system_const')
+    if unresolved:
+        logger.warning(f"damos :: {len(unresolved)} system constants unresolved: " +
+                       ", ".join(f"{name} ({reason})" for name, reason in unresolved.items()))
 
     # Resolve system condition:
-    syscond_dict = syscond_resolve(all_pavasts, values_dict)
+    syscond_dict, syscond_errors = syscond_resolve(global_all_pavast, values_dict, index)
+    if syscond_errors:
+        logger.warning(f"damos :: {len(syscond_errors)} system conditions unresolved: " +
+                       ", ".join(f"{name} ({reason})" for name, reason in syscond_errors.items()))
 
     # consider elements with the condition is True:
     consider_elements = []
@@ -770,18 +660,24 @@ def new_pavast_file(modified_paths: List=None,
     reference_elements = []
     for fpath in modified_paths:
         path = os.path.join(PATH, fpath)
-        reference_elements.extend(get_original_elements(path, current_exports, consider_elements))
+        reference_elements.extend(get_original_elements(path, current_exports,
+                                                        consider_elements, index))
 
     # Creating a *_pavast.xml which add in founded elements
-    created_resources, references_list = get_path_of_element(reference_elements, references, current_exports)
+    created_resources, references_list = get_path_of_element(reference_elements, references,
+                                                             current_exports, index)
 
     # Creating a services resource dictionary
     services_resources, task_path = create_service_resources(global_all_pavast,
-                                                            references_list)
+                                                            references_list, index)
 
-    filename = element_stuffing(created_resources)
+    filename = element_stuffing(created_resources, index)
     new_services = Create_service_function(services_resources, filename)
     config_task_option(task_path, new_services)
+
+    stats = doc_cache.cache_info()
+    logger.info(f"damos :: pavast cache {stats.hits} hits, {stats.misses} parses "
+                f"({stats.entries} documents cached)")
     return filename
 
 """
@@ -793,8 +689,8 @@ def path_global_config(folder: str, global_path: str=None)->str:
     args:
         folder : name of generated folder of damos
     """
-    config_path = (global_path or WORKING_PATH) + r'\swb'
-    generated_folder = config_path + rf"\{folder}"
+    config_path = os.path.join(global_path or WORKING_PATH, 'swb')
+    generated_folder = os.path.join(config_path, folder)
     if not os.path.isdir(config_path):
         os.makedirs(config_path)
     if not os.path.isdir(generated_folder):
@@ -813,8 +709,8 @@ def create_pavast_file_option(modified_paths: List, mandatory_paths: List,
         if path not in selected_paths:
             selected_paths.append(path)
 
-    filegroup = path_global_config(r'filegroup\src_lists')
-    filename = os.path.join(str(filegroup + r"\pavast_files.lst").replace('/', '\\'))
+    filegroup = path_global_config(os.path.join('filegroup', 'src_lists'))
+    filename = os.path.normpath(os.path.join(filegroup, "pavast_files.lst"))
 
     smb_pavast_file = new_pavast_file(selected_paths, all_pavast_paths)
     pavast_files = []
@@ -825,7 +721,7 @@ def create_pavast_file_option(modified_paths: List, mandatory_paths: List,
         for path in pavast_files:
             file.write(path + '\n')
     file.close()
-    formated_name = filename.split(os.path.join(PATH.replace('/', '\\'), ''))[1]
+    formated_name = os.path.relpath(filename, PATH)
     return formated_name
 
 """
@@ -839,7 +735,7 @@ def opt_parse(path: str, keyword: str,
     --> change criteria parameter for smb run.
     """
 
-    path_name = path.split('\\')[-1]
+    path_name = os.path.basename(path)
     parameter_check = ['--pavast_files', '--data_mcop_tmp_dir','--swb_data_log_dir'
                        '--swb_src_mcop_tmp_dir', '--swb_src_data_tmp_dir',
                        '--data_include_dir', '--data_tmp_dir', '--mcop_include_dir',
@@ -932,29 +828,29 @@ def get_original_command()->List:
     read inside the all_commands.logs to get the command to run Damos tool
     ==> return the List of original commands without changing the arguments.
     """
-    command_path = os.path.join(PATH, r'_log\swb\All_Commands.log')
+    command_path = os.path.join(PATH, '_log', 'swb', 'All_Commands.log')
     if not os.path.exists(command_path):
         # logger.info('No command to run.')
         return None
     all_command = []
     damos_command = []
+    found = set()
     with open(command_path, 'r', encoding='utf-8') as file:
-        for line in file.readlines():
+        for line in file:
+            line = line.strip()
             if '#' not in line and "cmd.exe /q /c call" in line:
                 all_command.append(line)
 
             if '_gen/swb/module/data/' in line \
                     and ('damoskdo.exe' in line or 'dgs_ice.cmd' in line) \
-                    and line not in damos_command:
-                damos_command.append(line.strip())
+                    and line not in found:
+                damos_command.append(line)
+                found.add(line)
 
-    damos_command.sort(key=lambda i: all_command.index(i)
-    if i in all_command else len(all_command) - 1)
-    for command in damos_command:
+    damos_command = OrderedRegistry(all_command).sort(damos_command)
+    for index, command in enumerate(damos_command):
         if 'cmd.exe /q /c call' not in command:
-            index = damos_command.index(command)
-            old_command = damos_command.pop(index)
-            damos_command.insert(index, 'cmd.exe /q /c call '+ old_command)
+            damos_command[index] = 'cmd.exe /q /c call ' + command
     return damos_command
 
 
@@ -1006,8 +902,8 @@ def get_command(modified_paths: List,
 
     # create folder for Damos tools
     path_global_config('module')
-    path_global_config(r'module\data\opt')
-    path_global_config(r'module\coreproc')
+    path_global_config(os.path.join('module', 'data', 'opt'))
+    path_global_config(os.path.join('module', 'coreproc'))
     makeware_path = WORKING_PATH + '/MakeWare'
 
     #TODO: consider empty axispoints.lst for this version
@@ -1019,15 +915,14 @@ def get_command(modified_paths: List,
     file.close()
 
     # TODO: consider empty filelist_gen_pavast_xml for this version
-    gen_pavast_path = os.path.join(PATH,
-                       r'_gen\swb\module\coreproc\filelist_gen_pavast_xml.txt')
-    with open(gen_pavast_path.replace('\_gen', '\_smb'), 'w',
-              encoding='utf-8') as file:
+    smb_pavast_path = os.path.join(PATH, '_smb', 'swb', 'module', 'coreproc',
+                                   'filelist_gen_pavast_xml.txt')
+    with open(smb_pavast_path, 'w', encoding='utf-8') as file:
         file.write("")
     file.close()
 
     # checking if the option file exist in PVER, if not abort!
-    opt_dir = os.path.join(PATH, r'_gen\swb\module\data\opt')
+    opt_dir = os.path.join(PATH, '_gen', 'swb', 'module', 'data', 'opt')
     if not os.path.isdir(opt_dir):
         return None, env
 
@@ -1041,8 +936,8 @@ def get_command(modified_paths: List,
     all_pavast_paths = get_all_pavast_file(pavast_paths, original_opt_list)
 
     # consider path in side the condsys_pavast_files.lst as mandatory files
-    condsys_path = os.path.join(PATH,
-                                r'_gen\swb\filegroup\src_lists\condsys_pavast_files.lst')
+    condsys_path = os.path.join(PATH, '_gen', 'swb', 'filegroup', 'src_lists',
+                                'condsys_pavast_files.lst')
     with open(condsys_path, 'r', encoding='utf-8') as file:
         for line in file.readlines():
             mandatory_paths.append(line.strip())
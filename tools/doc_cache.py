@@ -0,0 +1,123 @@
+"""
+Process-wide cache of parsed XML documents.
+The DAMOS preparation reads the same *_pavast.xml files from many places; this cache makes
+sure each file is parsed once as long as it does not change on disk.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from lxml import etree
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "entries", "size"])
+
+# default bounds: number of documents and sum of the file sizes kept in memory
+MAX_ENTRIES = 512
+MAX_BYTES = 1024 * 1024 * 1024
+
+
+def normalize(path: str) -> str:
+    """
+    Normalize a path so that different spellings of the same file share one cache entry.
+    """
+    return os.path.normcase(os.path.abspath(path))
+
+
+class DocumentCache:
+    """
+    LRU cache of parsed documents keyed by normalized path and validated with (mtime, size).
+
+    The returned trees are shared: callers must not modify them,
+    copy the nodes (copy.deepcopy) before inserting them into another tree.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._documents = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, path: str):
+        """
+        Return the parsed tree of the path, parsing the file only if it is unknown or changed.
+        """
+        key = normalize(path)
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._documents.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        tree = etree.parse(key)
+        with self._lock:
+            self.misses += 1
+            self._discard(key)
+            self._documents[key] = (stamp, tree)
+            self._size += stamp[1]
+            self._evict()
+        return tree
+
+    def invalidate(self, path: str = None):
+        """
+        Drop the cached document of the path, or every document if no path is given.
+        """
+        with self._lock:
+            if path is None:
+                self._documents.clear()
+                self._size = 0
+            else:
+                self._discard(normalize(path))
+
+    def reset_stats(self):
+        """
+        Reset the hit/miss counters, e.g. at the start of a build.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Return the hit/miss statistics of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             len(self._documents), self._size)
+
+    def _discard(self, key):
+        entry = self._documents.pop(key, None)
+        if entry is not None:
+            self._size -= entry[0][1]
+
+    def _evict(self):
+        # always keep the most recent document, even if it exceeds the byte limit by itself
+        while len(self._documents) > 1 and (len(self._documents) > self.max_entries
+                                             or self._size > self.max_bytes):
+            _, (stamp, _) = self._documents.popitem(last=False)
+            self._size -= stamp[1]
+            self.evictions += 1
+
+
+documents = DocumentCache()
+
+
+def parse(path: str):
+    """
+    Parse a document through the process-wide cache.
+    """
+    return documents.parse(path)
+
+
+def cache_info() -> CacheInfo:
+    """
+    Hit/miss statistics of the process-wide cache.
+    """
+    return documents.info()
@@ -1,7 +1,11 @@
+import ast
 import math
 import re
 
+from collections import deque
+from functools import lru_cache
 from numbers import Integral, Real
+from typing import Dict, List
 
 # system constant syntax:
 char_coded = 'i'
@@ -114,114 +118,210 @@ damos = {
     'defined': damos_define
 }
 
-def eval_nested(eval_str, use_dict={}, nested_cnt=0):
-    """DOC
-    In some cases more then maximum count of braces is used in damos expressions.\\
-    This function calls eval for each nested expression beginning from inside.\\
-    """
-    this_str = ''
-    other_str = ''
-    brace_cnt = 0
-    for idx, chr in enumerate(eval_str):
-        if chr == ')':
-            brace_cnt -= 1
-            if brace_cnt == 0:
-                this_str += eval_nested(other_str, use_dict=use_dict, nested_cnt=nested_cnt + 1)
-                other_str = ''
-                continue
-            elif brace_cnt < 0:
-                # error 'should not happen
-                raise SyntaxError('invalid syntax')
-        elif chr == '(':
-            brace_cnt += 1
-            if brace_cnt == 1:
-                continue
-
-        if brace_cnt > 0:
-            other_str += chr
-        else:
-            this_str += chr
-    else:
-        if brace_cnt != 0:
-            raise SyntaxError('unexpected EOF while parsing')
-        if nested_cnt:
-            return '(' + str(eval(this_str, use_dict)) + ')'
-        else:
-            return eval(this_str, use_dict)
+# functions visible to the compiled expressions, python builtins are not available
+_globals = dict(damos, __builtins__={})
 
+# python syntax allowed in a compiled expression (calls, names and constants are checked separately)
+_allowed_nodes = (ast.Expression, ast.Load,
+                  ast.BoolOp, ast.And, ast.Or,
+                  ast.UnaryOp, ast.Not, ast.USub, ast.UAdd, ast.Invert,
+                  ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+                  ast.LShift, ast.RShift, ast.BitAnd, ast.BitOr, ast.BitXor,
+                  ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
 
-def evaluate(value_str, original_values, type, post_eval=True):
+class CompiledExpression:
     """
-    Evaluate the value objects.
-    1. remove tail tag or un-relative tag
-    2. check if value is int or float and return accordingly
-    3. if post_value is False start to resolve ref tags
-    ---OPT
-    value_str:str value string
+    Expression of a system constant or a system condition, compiled once.
+        names: referenced elements in the order of the placeholders _sc0, _sc1, ...
+        code: python code object, None if the expression is a plain number.
+        constant: value of a plain number.
+    """
+    __slots__ = ("source", "names", "code", "constant")
+
+    def __init__(self, source: str, names: List, code=None, constant=None):
+        self.source = source
+        self.names = names
+        self.code = code
+        self.constant = constant
+
+    def evaluate(self, symbols: Dict):
+        """
+        Evaluate the expression, symbols maps each referenced name to its value.
+        """
+        if self.code is None:
+            return self.constant
+        namespace = {placeholder(position): symbols[name]
+                     for position, name in enumerate(self.names)}
+        return eval(self.code, _globals, namespace)
+
+
+def placeholder(position: int) -> str:
+    """
+    Identifier standing for the referenced element at position.
+    """
+    return f"_sc{position}"
 
+
+def _check(tree: ast.AST, names: List):
     """
-    check_type = type
-    # 1. remove comments
-    replaced = re_find_comment.sub('', value_str)
+    Allow only the DAMOS operators and functions in the parsed expression.
+    """
+    allowed = set(placeholder(position) for position in range(len(names)))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in damos or node.keywords:
+                raise SyntaxError("unsupported call in damos expression")
+        elif isinstance(node, ast.Name):
+            if node.id not in allowed and node.id not in damos:
+                raise NameError(f"name '{node.id}' is not defined")
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)):
+                raise SyntaxError(f"unsupported constant {node.value!r} in damos expression")
+        elif not isinstance(node, _allowed_nodes):
+            raise SyntaxError(f"unsupported {type(node).__name__} in damos expression")
+
+
+@lru_cache(maxsize=None)
+def compile_expression(value_str: str, type: str) -> CompiledExpression:
+    """
+    Normalize a value string and compile it, memoized by source string and type.
+    1. remove comments and the value/condition tags
+    2. replace ref tags, p()/i() and defined() by placeholders
+    3. translate the DAMOS operators and literals to python
+    4. parse, check against the allowed operators and functions and compile
+    """
+    names = []
 
-    # 2. remove un-related tag name
-    if check_type == 'system_const':
+    def reference(name: str) -> str:
+        if name not in names:
+            names.append(name)
+        return placeholder(names.index(name))
+
+    # 1. remove comments and un-related tag name
+    replaced = re_find_comment.sub('', value_str)
+    if type == 'system_const':
         replaced = re_find_value_tag.sub("", replaced)
-    elif check_type == 'syscond':
+    elif type == 'syscond':
         replaced = re_find_cond_tag.sub(r"\g<2>", replaced)
-
     replaced = re_find_whitespace.sub("", replaced)
 
-    # 3. start resolve ref tag inside the value tag
-    if len(re_find_sc.findall(replaced)) > 0:
-        match = re_find_sc.sub(
-            lambda x: str(original_values[x.group(2)]),
-            replaced).strip()
-        replaced = str(evaluate(match, original_values, check_type, post_eval=False))
-
-    if len(re_find_sc_decoded.findall(replaced)) > 0:
-        match = re_find_sc_decoded.sub(lambda x: str(original_values[x.group(1)]),
-                                       replaced).strip()
-        replaced = str(evaluate(match, original_values, check_type, post_eval=False))
+    # 2. referenced elements
+    replaced = re_find_sc.sub(lambda x: reference(x.group(2)), replaced)
+    replaced = re_find_sc_decoded.sub(lambda x: reference(x.group(1)), replaced)
 
     if replaced.isdigit():
-        if post_eval:
-            return int(replaced)
-        else:
-            return replaced
-
-    if replaced.count('.') ==1:
-        if replaced.replace('.', '').isdigit():
-            if post_eval:
-                return float(replaced)
-            else:
-                return replaced
-
-    # 4. replace negations ! with not
-    replaced = re_find_not.sub(' not \g<1>', replaced)
-
-    # 5. replace digit+'u', ie '1u'
-    replaced = re_find_digit_u.sub('\g<1>', replaced)
-
-    # 6. replace special operation : && with and -- || with or
-    replaced = re_find_operators.sub(lambda x: char_html_dict[x.group(1)],
-                                           replaced).strip()
+        return CompiledExpression(value_str, names, constant=int(replaced))
+    if replaced.count('.') == 1 and replaced.replace('.', '').isdigit():
+        return CompiledExpression(value_str, names, constant=float(replaced))
+
+    # 3. negation, digit+'u', html characters, && / ||
+    replaced = re_find_not.sub(r' not \g<1>', replaced)
+    replaced = re_find_digit_u.sub(r'\g<1>', replaced)
+    replaced = re_find_operators.sub(lambda x: char_html_dict[x.group(1)], replaced).strip()
     replaced = replaced.replace('||', ' or ').replace('&&', ' and ')
 
-    # 7. replace defined()
-    replaced = re_find_defined.sub(lambda x: original_values[x.group(3)],
-                                        replaced).strip()
+    # defined(X) takes the value of X, X may already be a placeholder
+    placeholders = set(placeholder(position) for position in range(len(names)))
+    replaced = re_find_defined.sub(
+        lambda x: x.group(3) if x.group(3) in placeholders else reference(x.group(3)),
+        replaced).strip()
 
-    # 8. replace false|true
+    # false|true and octal numbers
     replaced = re_find_false.sub('False', replaced)
     replaced = re_find_true.sub('True', replaced)
-
-    # 9. replace numeric problems:
     replaced = re_val_oct_check.sub(lambda x: x.group(1) + 'o' + x.group(2), replaced)
 
-    replaced = eval_nested(replaced, damos)
-    if isinstance(replaced, Real) or isinstance(replaced, Integral):
-        return replaced
-    else:
-        new_content = evaluate(replaced, original_values, check_type, post_eval=False)
-        return new_content
+    # 4. compile
+    tree = ast.parse(replaced, mode='eval')
+    _check(tree, names)
+    return CompiledExpression(value_str, names, code=compile(tree, '<damos>', 'eval'))
+
+
+def evaluate(value_str, original_values, type, post_eval=True):
+    """
+    Evaluate the value objects.
+    The value string is compiled once (see compile_expression), the referenced elements
+    are taken from original_values; values which are still strings are evaluated first.
+    ---OPT
+    value_str:str value string
+    post_eval: False returns the result as string
+
+    """
+    resolving = set()
+
+    def resolve(expression: CompiledExpression):
+        symbols = {}
+        for name in expression.names:
+            value = original_values[name]
+            if isinstance(value, str):
+                if name in resolving:
+                    raise RecursionError(f"cyclic reference of {name}")
+                resolving.add(name)
+                value = resolve(compile_expression(value, type))
+                resolving.discard(name)
+            symbols[name] = value
+        return expression.evaluate(symbols)
+
+    result = resolve(compile_expression(value_str, type))
+    return result if post_eval else str(result)
+
+
+def resolve_all(values: Dict, type: str = 'system_const') -> (Dict, Dict):
+    """
+    Resolve every value string of the dictionary exactly once.
+    The dependencies between the values form a graph which is evaluated in topological order,
+    each result is reused by the values referring to it.
+    return:
+        resolved: name -> value, in the order of values.
+        unresolved: name -> reason, for unknown references, cycles and invalid expressions.
+    """
+    expressions = {}
+    unresolved = {}
+    for name, value in values.items():
+        if not isinstance(value, str):
+            continue
+        try:
+            expressions[name] = compile_expression(value, type)
+        except Exception as error:
+            unresolved[name] = f"invalid expression: {error}"
+
+    # dependency graph between the values still to evaluate
+    dependents = {name: [] for name in expressions}
+    indegree = {}
+    for name, expression in expressions.items():
+        pending = set()
+        for reference in expression.names:
+            if reference not in values:
+                unresolved.setdefault(name, f"unknown reference {reference}")
+            elif reference in expressions:
+                pending.add(reference)
+        indegree[name] = len(pending)
+        for reference in pending:
+            dependents[reference].append(name)
+
+    results = {name: value for name, value in values.items() if not isinstance(value, str)}
+    queue = deque(name for name, degree in indegree.items() if degree == 0)
+    while queue:
+        name = queue.popleft()
+        if name not in unresolved:
+            expression = expressions[name]
+            failed = [reference for reference in expression.names if reference in unresolved]
+            if failed:
+                unresolved[name] = f"depends on unresolved {', '.join(failed)}"
+            else:
+                try:
+                    results[name] = expression.evaluate(results)
+                except Exception as error:
+                    unresolved[name] = f"{error.__class__.__name__}: {error}"
+        for dependent in dependents[name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                queue.append(dependent)
+
+    # the remaining values are part of, or depend on, a cycle
+    for name, degree in indegree.items():
+        if degree > 0:
+            unresolved.setdefault(name, "cyclic reference")
+
+    resolved = {name: results[name] for name in values if name in results}
+    return resolved, unresolved
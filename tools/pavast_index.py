@@ -0,0 +1,445 @@
+"""
+Symbol table of the *_pavast.xml files of a PVER.
+Every file is read once and summarised in a PavastRecord; the DAMOS preparation then works
+with dictionary lookups instead of searching the documents again for every element.
+"""
+import os
+import pickle
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from lxml import etree
+
+from tools import doc_cache
+
+# version of the records stored on disk, increase it when PavastRecord changes
+INDEX_VERSION = 3
+INDEX_FILE = 'pavast_index.pkl'
+
+# tags collected from the owned and exported elements (see damos.extract_elements)
+ELEMENT_TAGS = ["SW-SYSTEMCONST-REF",
+                "SW-SERVICE-REF",
+                "SW-CLASS-REF",
+                "SW-VARIABLE-REF",
+                "SW-DATA-CONSTR-REF",
+                ]
+
+# tags collected from the imported elements
+IMPORT_TAGS = ["SW-SYSTEMCONST-REF",
+               "SW-VARIABLE-REF",
+               "SW-SERVICE-REF",
+               "SW-CLASS-REF",
+               "SW-SYSTEMCONST-CODED-REF"]
+
+# tags referring to other elements inside a definition of the dictionary
+DEFINITION_TAGS = ["SW-VARIABLE-REF",
+                   "SW-SERVICE-REF",
+                   "SW-SYSTEMCONST-REF",
+                   "SW-CLASS-REF",
+                   "SW-COMPU-METHOD-REF",
+                   "SW-DATA-CONSTR-REF",
+                   "SW-SYSTEMCONST-CODED-REF"
+                   ]
+
+# elements imported under a system condition
+SYSCOND_TAGS = ["SW-SYSTEMCONST-REF-SYSCOND",
+                "SW-VARIABLE-REF-SYSCOND",
+                "SW-SERVICE-REF-SYSCOND",
+                "SW-CLASS-REF-SYSCOND",
+                ]
+
+# value tags of a system constant (see helper.values_tag)
+VALUE_TAGS = ['VF', 'V', 'VT']
+
+re_number = re.compile(r"[+-]?([0-9]*[.])?[0-9]+")
+re_remove_tail = re.compile(r"[\t\n]*")
+
+
+class PavastRecord:
+    """
+    Summary of a single *_pavast.xml file.
+        elements: owned and exported elements, in the order of ELEMENT_TAGS.
+        imports: imported elements, in the order of IMPORT_TAGS.
+        entries: definitions of the dictionary as (name, category, references, vf_references).
+        sysconds: conditional elements as (tag, name, condition), in the order of SYSCOND_TAGS.
+        systemconsts: owned then exported system constants.
+        constants: system constants of the dictionaries as (name, value string or None).
+        services: PROCESS services as (name, [written variables and accessed services]).
+    """
+    __slots__ = ("path", "elements", "imports", "entries", "sysconds",
+                 "systemconsts", "constants", "services")
+
+    def __init__(self, path: str, elements: List, imports: List, entries: List, sysconds: List,
+                 systemconsts: List, constants: List, services: List):
+        self.path = path
+        self.elements = elements
+        self.imports = imports
+        self.entries = entries
+        self.sysconds = sysconds
+        self.systemconsts = systemconsts
+        self.constants = constants
+        self.services = services
+
+
+def _localname(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1] if tag[0] == '{' else tag
+
+
+def _entry(child, category: str):
+    """
+    Definition of the dictionary as (name, category, references, vf_references).
+    """
+    short_name = child.find('.//SHORT-NAME')
+    name = short_name.text if short_name is not None else None
+    references = [var.text for tag in DEFINITION_TAGS
+                  for var in child.iter(tag) if var is not child]
+    vf_references = []
+    for vf in child.iter('VF'):
+        vf_references.extend(element.text for element in vf)
+        if vf.text is not None and not re_number.match(vf.text.strip()):
+            vf_references.append(vf.text)
+    return name, category, references, vf_references
+
+
+def _syscond(element, tag: str):
+    """
+    Conditional element as (tag, name, condition string).
+    """
+    reference = element.find(tag.replace("-SYSCOND", ""))
+    condition = element.find('SW-SYSCOND')
+    if condition is not None:
+        condition = re_remove_tail.sub("", etree.tostring(condition, pretty_print=True)
+                                       .decode()).strip()
+    return tag, reference.text if reference is not None else None, condition
+
+
+def _constant(element):
+    """
+    System constant as (name, value string), the value is taken from the [V,VF,VT] tags.
+    """
+    value = None
+    for tag in VALUE_TAGS:
+        node = element.find('.//{*}' + tag)
+        if node is not None:
+            value = re_remove_tail.sub("", etree.tostring(node, pretty_print=True)
+                                       .decode().strip())
+    short_name = element.find('.//{*}SHORT-NAME')
+    return short_name.text if short_name is not None else None, value
+
+
+def _service(element):
+    """
+    PROCESS service as (name, accessed), accessed holds the written variables and the
+    accessed services; None for the other services.
+    """
+    category = element.find('.//{*}CATEGORY')
+    if category is None or category.text != 'PROCESS':
+        return None
+    accessed = []
+    for variable in element.findall('.//{*}SW-ACCESSED-VARIABLE'):
+        mode = variable.find('.//{*}SW-VARIABLE-USAGE')
+        if mode is not None and mode.text in ['WRITE', 'READWRITE']:
+            accessed.append(etree.tostring(variable, pretty_print=True, encoding='utf-8'))
+    for service_ref in element.findall('.//{*}SW-ACCESSED-SERVICE'):
+        accessed.append(etree.tostring(service_ref, pretty_print=True, encoding='utf-8'))
+    return element.find('.//{*}SHORT-NAME').text, accessed
+
+
+def scan(path: str) -> PavastRecord:
+    """
+    Read a *_pavast.xml file once and create its record.
+    The file is streamed with iterparse: only the element being summarised is kept in memory,
+    everything already read is cleared so large files do not need their full tree.
+    """
+    owned = {tag: [] for tag in ELEMENT_TAGS}
+    exported = {tag: [] for tag in ELEMENT_TAGS}
+    imported = {tag: [] for tag in IMPORT_TAGS}
+    sysconds = {tag: [] for tag in SYSCOND_TAGS}
+    owned_sc, exported_sc = [], []
+    entries, constants, services = [], [], []
+
+    stack = []
+    # depth of the first dictionary, its categories and the pending entries of a category
+    dictionary_depth = None
+    dictionary_done = False
+    category_entries, category_named = [], False
+    # elements which are summarised on their end event, nothing below them can be cleared
+    captured = 0
+    capture_stack = []
+
+    for event, element in etree.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            tag = _localname(element.tag)
+            depth = len(stack)
+            stack.append(tag)
+            capture = (tag in SYSCOND_TAGS or tag == 'SW-SERVICE'
+                       or (tag == 'SW-SYSTEMCONST' and 'SW-DATA-DICTIONARY-SPEC' in stack)
+                       or (dictionary_depth is not None and depth == dictionary_depth + 2))
+            if tag == 'SW-DATA-DICTIONARY-SPEC' and dictionary_depth is None and not dictionary_done:
+                dictionary_depth = depth
+            capture_stack.append(capture)
+            captured += capture
+            continue
+
+        tag = stack[-1]
+        depth = len(stack) - 1
+        inside = stack[:-1]
+
+        if tag in ELEMENT_TAGS and 'SW-FEATURE-ELEMENTS' in inside:
+            if 'SW-FEATURE-OWNED-ELEMENTS' in inside:
+                owned[tag].append(element.text)
+            if 'SW-INTERFACE-EXPORT' in inside:
+                exported[tag].append(element.text)
+        if tag in IMPORT_TAGS and 'SW-INTERFACE-IMPORT' in inside:
+            imported[tag].append(element.text)
+        if tag == 'SW-SYSTEMCONST-REF':
+            if 'SW-FEATURE-OWNED-ELEMENTS' in inside:
+                owned_sc.append(element.text)
+            if 'SW-INTERFACE-EXPORT' in inside:
+                exported_sc.append(element.text)
+        if tag in SYSCOND_TAGS:
+            sysconds[tag].append(_syscond(element, tag))
+        if tag == 'SW-SYSTEMCONST' and 'SW-DATA-DICTIONARY-SPEC' in inside and len(element):
+            constants.append(_constant(element))
+        if tag == 'SW-SERVICE':
+            service = _service(element)
+            if service is not None:
+                services.append(service)
+
+        if dictionary_depth is not None:
+            # a category is kept only if it contains a SHORT-NAME (see definitions)
+            if tag == 'SHORT-NAME' and depth > dictionary_depth + 1:
+                category_named = True
+            if depth == dictionary_depth + 2:
+                category_entries.append(_entry(element, stack[-2]))
+            elif depth == dictionary_depth + 1:
+                if category_named:
+                    entries.extend(category_entries)
+                category_entries, category_named = [], False
+            elif depth == dictionary_depth:
+                dictionary_depth, dictionary_done = None, True
+
+        stack.pop()
+        captured -= capture_stack.pop()
+        if not captured:
+            element.clear()
+            parent = element.getparent()
+            # the root has no parent, its siblings are the comments and PIs of the document
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    elements = []
+    for tag in ELEMENT_TAGS:
+        for name in owned[tag] + exported[tag]:
+            if name not in elements:
+                elements.append(name)
+    imports = [name for tag in IMPORT_TAGS for name in imported[tag]]
+
+    systemconsts = []
+    for name in owned_sc + exported_sc:
+        if name not in systemconsts:
+            systemconsts.append(name)
+
+    return PavastRecord(path, elements, imports, entries,
+                        [syscond for tag in SYSCOND_TAGS for syscond in sysconds[tag]],
+                        systemconsts, constants, services)
+
+
+class PavastIndex:
+    """
+    Symbol table over the *_pavast.xml files of a PVER:
+        element name -> defining file (owners)
+        file -> owned/exported/imported elements (records)
+        element -> outgoing *-REF/VF references (references)
+    """
+
+    def __init__(self, paths: List = None):
+        self.records = {}
+        self.stamps = {}
+        self._nodes = {}
+        if paths:
+            self.update(paths)
+
+    @staticmethod
+    def key(path: str) -> str:
+        """
+        Key of a path in the index.
+        """
+        return os.path.normpath(path)
+
+    def update(self, paths: List, fingerprints: Dict = None, workers: int = 0) -> int:
+        """
+        Read every path which is not indexed yet or has changed since it was indexed.
+        A file is changed when its size, mtime or workunit CRC (fingerprints) differ.
+        With more than one worker the files are scanned in a pool of processes,
+        the records are the same as in the serial mode.
+        Return the number of files read.
+        """
+        fingerprints = fingerprints or {}
+        changed = {}
+        for path in paths:
+            key = self.key(path)
+            if not os.path.exists(key) or key in changed:
+                continue
+            stat = os.stat(key)
+            stamp = (stat.st_size, stat.st_mtime_ns, fingerprints.get(key))
+            if key not in self.records or self.stamps.get(key) != stamp:
+                changed[key] = stamp
+
+        keys = list(changed)
+        if workers > 1 and len(keys) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                records = list(pool.map(scan, keys, chunksize=max(1, len(keys) // (workers * 4))))
+        else:
+            records = [scan(key) for key in keys]
+
+        for key, record in zip(keys, records):
+            self.discard(key)
+            self.records[key] = record
+            self.stamps[key] = changed[key]
+        return len(keys)
+
+    def record(self, path: str) -> PavastRecord:
+        """
+        Return the record of the path, reading the file on first access.
+        """
+        key = self.key(path)
+        record = self.records.get(key)
+        if record is None:
+            record = scan(key)
+            self.records[key] = record
+        return record
+
+    def discard(self, path: str):
+        """
+        Forget the record of a path, it will be read again on next access.
+        """
+        key = self.key(path)
+        self.records.pop(key, None)
+        self.stamps.pop(key, None)
+        self._nodes.pop(key, None)
+
+    def save(self, path: str):
+        """
+        Store the index on disk: a version header followed by the records.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump({"version": INDEX_VERSION}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump((self.records, self.stamps), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PavastIndex':
+        """
+        Load an index stored by save(), an empty index is returned if the file is missing,
+        unreadable or written by another version.
+        """
+        index = cls()
+        if not os.path.isfile(path):
+            return index
+        try:
+            with open(path, 'rb') as file:
+                header = pickle.load(file)
+                if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+                    return index
+                index.records, index.stamps = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                TypeError, ValueError):
+            return cls()
+        return index
+
+    def owners(self, paths: List) -> Dict:
+        """
+        Map each owned or exported element to the (last) path defining it.
+        """
+        created_data = {}
+        for path in paths:
+            if os.path.exists(path):
+                for name in self.record(path).elements:
+                    created_data[name] = path
+        return created_data
+
+    def elements(self, path: str) -> List:
+        """
+        Owned and exported elements of the path.
+        """
+        return list(self.record(path).elements)
+
+    def imported(self, path: str, export_variables, consider_variables) -> List:
+        """
+        Imported elements of the path which are considered and not exported.
+        """
+        reference_variables = []
+        for name in self.record(path).imports:
+            if name not in export_variables \
+                    and name not in reference_variables \
+                    and name in consider_variables:
+                reference_variables.append(name)
+        return reference_variables
+
+    def references(self, path: str, key: str, export_variables) -> List:
+        """
+        References used by the definition of key, followed by the references of the VF values
+        found in the dictionary of the path.
+        """
+        variables = []
+        seen = set()
+        for name, _, references, vf_references in self.record(path).entries:
+            if name == key:
+                for reference in references:
+                    if reference not in export_variables:
+                        variables.append(reference)
+                        seen.add(reference)
+            for reference in vf_references:
+                if reference not in seen:
+                    variables.append(reference)
+                    seen.add(reference)
+        return variables
+
+    def definitions(self, path: str, key: str) -> List:
+        """
+        Definition nodes of key in the dictionary of the path as (category, node).
+        The nodes belong to the shared document of the cache and must be copied before use.
+        """
+        nodes = self._nodes.get(self.key(path))
+        if nodes is None:
+            nodes = {}
+            root = doc_cache.parse(path).getroot()
+            dictionary = root.find(".//SW-DATA-DICTIONARY-SPEC")
+            if dictionary is not None:
+                for category in dictionary.xpath('*[.//SHORT-NAME]'):
+                    for child in category:
+                        short_name = child.find('.//SHORT-NAME')
+                        if short_name is not None:
+                            nodes.setdefault(short_name.text, []).append((category.tag, child))
+            self._nodes[self.key(path)] = nodes
+        return nodes.get(key, [])
+
+
+def workunit_fingerprints(root: str) -> Dict:
+    """
+    CRC of every *_pavast.xml file registered in the workunit database of the PVER.
+    """
+    fingerprints = {}
+    database = os.path.join(root, "workunit.lws.cc.db3")
+    if not os.path.isfile(database):
+        return fingerprints
+    conn = sqlite3.connect(database)
+    try:
+        rows = conn.execute(
+            "SELECT f.FilePath, f.Name, f.Extension, f.FileSize, f.CRC "
+            "FROM Files as f "
+            "WHERE f.Name LIKE '%\\_pavast' ESCAPE '\\' AND f.Extension = 'xml'").fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        conn.close()
+    for file_path, name, ext, size, crc in rows:
+        path = os.path.join(root, (file_path or '').replace('\\', '/'), f"{name}.{ext}")
+        fingerprints[os.path.normpath(path)] = (str(size), crc)
+    return fingerprints
@@ -0,0 +1,74 @@
+"""
+Reference graph over the elements of the *_pavast.xml files.
+An element points to every element its definition refers to; the DAMOS preparation takes
+the closure of the imported elements to know which definitions the SMB pavast must contain.
+"""
+import os
+from collections import deque
+from typing import Dict, Iterable, List
+
+from tools.pavast_index import PavastIndex
+
+
+class ReferenceGraph:
+    """
+    Dependency graph of the pavast elements.
+    args:
+        index : symbol table of the pavast files.
+        owners : element -> path of the file defining it (see PavastIndex.owners).
+        exported : elements exported by the current run, their references are not followed.
+    """
+
+    def __init__(self, index: PavastIndex, owners: Dict, exported: Iterable):
+        self.index = index
+        self.owners = {name: os.path.normpath(path) for name, path in owners.items()}
+        self.exported = set(exported)
+        self._adjacency = {}
+
+    def successors(self, name: str) -> List:
+        """
+        Elements referenced by the definition of name, computed once per element.
+        """
+        successors = self._adjacency.get(name)
+        if successors is None:
+            path = self.owners.get(name)
+            successors = self.index.references(path, name, self.exported) if path else []
+            self._adjacency[name] = successors
+        return successors
+
+    def closure(self, seeds: List) -> List:
+        """
+        Breadth first closure of the seeds: the seeds followed by every reachable element
+        in the order it is discovered.
+        """
+        result = list(seeds)
+        visited = set(result)
+        queue = deque(name for name in result if name in self.owners)
+        while queue:
+            for successor in self.successors(queue.popleft()):
+                if successor not in visited:
+                    visited.add(successor)
+                    result.append(successor)
+                    if successor in self.owners:
+                        queue.append(successor)
+        return result
+
+    def closures(self, seed_sets: List) -> List:
+        """
+        Closure of several seed sets, sharing the adjacency computed so far.
+        """
+        return [self.closure(seeds) for seeds in seed_sets]
+
+    def resources(self, references_list: List) -> Dict:
+        """
+        Group the elements of a closure by the file defining them.
+        return: {path: [elements]} in the order of the owners, files without element are dropped.
+        """
+        created_resources = {path: [] for path in self.owners.values()}
+        seen = set()
+        for name in references_list:
+            path = self.owners.get(name)
+            if path is not None and name not in seen:
+                seen.add(name)
+                created_resources[path].append(name)
+        return {path: names for path, names in created_resources.items() if names}
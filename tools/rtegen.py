@@ -2,10 +2,9 @@
 TODO: Write docstring
 """
 import os.path
-import re
 
-from lxml import etree
 from PySide6.QtCore import QObject, Signal
+from tools import arxml_scanner
 from utilities.log import get_logger
 
 logger = get_logger(__name__)
@@ -63,36 +62,13 @@ def is_required(item_class, item_extension):
 def get_contract_argument(path):
     """
     Get the contract paths from the arxml file.
+    The file is scanned while it is parsed, tags are compared by local name
+    whatever the namespace of the document.
     """
-    result = []
-    component_types = ["APPLICATION-SW-COMPONENT-TYPE", "ATOMIC-SW-COMPONENT-TYPE",
-                       "COMPLEX-DEVICE-DRIVER-SW-COMPONENT-TYPE", "ECU-ABSTRACTION-SW-COMPONENT-TYPE",
-                       "NV-BLOCK-SW-COMPONENT-TYPE", "SENSOR-ACTUATOR-SW-COMPONENT-TYPE",
-                       "SERVICE-PROXY-SW-COMPONENT-TYPE", "SERVICE-SW-COMPONENT-TYPE"]
-    with open(path, 'r', encoding='utf-8') as file:
-        content = file.read()
-
-    content = re.sub('\\sxmlns="[^"]+"', '', content, count=1)
-    content = re.sub('\\sencoding="[^"]+"', '', content, count=1)
-    content = re.sub('\\sencoding=\'[^"]+\'', '', content, count=1)
-    root_node = etree.fromstring(content)
-
-    for component_type in component_types:
-        # search if component type is in the file
-        elements = root_node.findall(f".//{component_type}")
-        if len(elements)>0:
-            for element in elements:
-                if element.find('.//{*}SHORT-NAME') is not None:
-                    arg_path = [""]
-                    for ancestor in element.xpath('ancestor-or-self::*[.//SHORT-NAME]'):
-                        children = ancestor.getchildren()
-                        for child in children:
-                            # Only get short name if it is of actual ancestor of the SWC.
-                            if child.tag == "SHORT-NAME":
-                                arg_path.append(child.text)
-                                if ancestor.tag == component_type:
-                                    result.append(str.join("/", arg_path))
-    return result
+    # component paths grouped by component type
+    components = arxml_scanner.scan_file(path).components
+    return [component_path for component_type in arxml_scanner.COMPONENT_TYPES
+            for found_type, component_path in components if found_type == component_type]
 
 
 def get_command(paths, arxml_path) -> (str, str):
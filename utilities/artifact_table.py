@@ -0,0 +1,208 @@
+"""
+Columnar store of the artifacts loaded from the workunit database.
+The PVER tree, the tool filters and the build step read the artifacts from one table
+instead of a nested dictionary per artifact.
+"""
+import os
+import pickle
+import sqlite3
+import sys
+from array import array
+from collections import namedtuple
+
+# bump when the layout of the table changes, older cache files are then ignored
+CACHE_VERSION = 1
+CACHE_FILE = 'artifact_table.pkl'
+
+Artifact = namedtuple("Artifact", ["name", "cls", "variant", "upd", "f_name", "path", "ext",
+                                   "size", "crc"])
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ArtifactTable:
+    """
+    Artifacts of a PVER stored column by column, a row is one artifact of the tree.
+    Rows are numbered in the order of the tree: a parent comes before its children and the
+    children are ordered by class and name. The class, variant, update and extension
+    strings are interned, sizes and tree links are kept in arrays.
+    """
+
+    def __init__(self):
+        self.ids = array('l')
+        self.parent = array('l')
+        self.name = []
+        self.cls = []
+        self.variant = []
+        self.upd = []
+        self.f_name = []
+        self.path = []
+        self.ext = []
+        self.size = array('q')
+        self.crc = []
+        # children of row r are child_rows[child_offsets[r + 1]:child_offsets[r + 2]],
+        # the top-level artifacts are the children of row -1
+        self.child_offsets = array('l', [0, 0])
+        self.child_rows = array('l')
+        self._filters = {}
+
+    @classmethod
+    def from_rows(cls, relations: dict, details: dict, root_id: int = 1) -> "ArtifactTable":
+        """
+        Build the table from the rows of the workunit database.
+        args:
+            relations : {parent_id: [child_id]}, children ordered by class and name
+            details : {artifact_id: (cls, name, variant, Upd, file_name, path, ext, size, crc)}
+            root_id : artifact the tree starts from, it is not part of the table
+        Siblings with the same name are kept once, the last one wins.
+        """
+        table = cls()
+
+        def add(parent_row, parent_id):
+            siblings = {}
+            for child in relations.get(parent_id, []):
+                siblings[details[child][1]] = child
+            for child in siblings.values():
+                add(table._append(parent_row, child, details[child]), child)
+
+        add(-1, root_id)
+        table._link()
+        return table
+
+    def _append(self, parent_row, identifier, detail) -> int:
+        cls, name, variant, upd, file_name, path, ext, size, crc = detail
+        if file_name and ext:
+            file_name = "{}.{}".format(file_name, ext)
+            path = os.path.join(path, file_name)
+        self.ids.append(identifier)
+        self.parent.append(parent_row)
+        self.name.append(name)
+        self.cls.append(_intern(cls))
+        self.variant.append(_intern(variant))
+        self.upd.append(_intern(upd))
+        self.f_name.append(file_name)
+        self.path.append(path)
+        self.ext.append(_intern(ext))
+        self.size.append(-1 if size is None else size)
+        self.crc.append(crc)
+        return len(self.ids) - 1
+
+    def _link(self):
+        # counting sort of the rows by parent, the rows are already in sibling order
+        counts = array('l', [0]) * (len(self) + 2)
+        for parent in self.parent:
+            counts[parent + 2] += 1
+        for position in range(2, len(counts)):
+            counts[position] += counts[position - 1]
+        self.child_offsets = array('l', counts)
+        self.child_rows = array('l', [0]) * len(self)
+        for row, parent in enumerate(self.parent):
+            self.child_rows[counts[parent + 1]] = row
+            counts[parent + 1] += 1
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getstate__(self):
+        # the filters refer to the predicates, they are computed again after a load
+        state = self.__dict__.copy()
+        state["_filters"] = {}
+        return state
+
+    def children(self, row: int = -1):
+        """
+        Rows of the children of row, the top-level rows for -1
+        """
+        return self.child_rows[self.child_offsets[row + 1]:self.child_offsets[row + 2]]
+
+    def record(self, row: int) -> Artifact:
+        """
+        All columns of a row, the size as text like in the workunit tree
+        """
+        size = self.size[row]
+        return Artifact(self.name[row], self.cls[row], self.variant[row], self.upd[row],
+                        self.f_name[row], self.path[row], self.ext[row],
+                        str(size) if size >= 0 else str(None), self.crc[row])
+
+    def matching(self, predicate, *columns) -> frozenset:
+        """
+        Rows for which predicate(*columns) is true, e.g. matching(rtegen.is_required, "cls", "ext").
+        Missing values are given as empty strings, the result is computed once per predicate
+        and columns.
+        """
+        key = (predicate, columns)
+        rows = self._filters.get(key)
+        if rows is None:
+            values = zip(*(getattr(self, column) for column in columns))
+            rows = frozenset(row for row, value in enumerate(values)
+                             if predicate(*("" if item is None else item for item in value)))
+            self._filters[key] = rows
+        return rows
+
+    def to_dict(self, row: int = -1) -> dict:
+        """
+        Nested dictionary of the artifacts below row, in the format of the former loader
+        """
+        children_dict = {}
+        for child in self.children(row):
+            artifact = self.record(child)
+            children_dict[artifact.name] = {"cls": artifact.cls, "variant": artifact.variant,
+                                            "Upd": artifact.upd, "f_name": artifact.f_name,
+                                            "path": artifact.path, "ext": artifact.ext,
+                                            "size": artifact.size, "crc": artifact.crc,
+                                            "children": self.to_dict(child)}
+        return children_dict
+
+
+def database_stamp(database: str) -> tuple:
+    """
+    Fingerprint of the workunit database: (mtime_ns, size) of the file and of its
+    write-ahead log, and the schema version.
+    """
+    stat = os.stat(database)
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    if os.path.isfile(database + '-wal'):
+        wal = os.stat(database + '-wal')
+        stamp += [wal.st_mtime_ns, wal.st_size]
+    conn = sqlite3.connect(database)
+    try:
+        stamp.append(conn.execute("PRAGMA schema_version").fetchone()[0])
+    finally:
+        conn.close()
+    return tuple(stamp)
+
+
+def save_cache(path: str, stamp: tuple, table: ArtifactTable, arxml_files: list):
+    """
+    Store the loaded table on disk: a header with the version and the database stamp
+    followed by the table and the arxml files.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        pickle.dump({"version": CACHE_VERSION, "stamp": stamp}, file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump((table, arxml_files), file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def load_cache(path: str, stamp: tuple):
+    """
+    Load a table stored by save_cache().
+    return: (table, arxml files), None if the file is missing, unreadable, written by another
+    version or for another state of the database.
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            header = pickle.load(file)
+            if not isinstance(header, dict) or header.get("version") != CACHE_VERSION \
+                    or header.get("stamp") != stamp:
+                return None
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+            TypeError, ValueError):
+        return None
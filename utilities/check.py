@@ -3,13 +3,27 @@ TODO: Write docstring
 """
 import os
 import ctypes  # For simple message box
+import hashlib
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from os import path
+from typing import Dict
 from subprocess import getoutput as go  # To fetch windows specific information
 from lxml import etree
+from utilities import fs_index
 from utilities.log import get_logger
 
 logger = get_logger(__name__)
 
+# files are hashed by chunks of CHUNK_SIZE bytes, on up to HASH_WORKERS threads
+CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# hashes of the checked files, kept between builds in _smb/pver
+HASH_CACHE_VERSION = 1
+HASH_CACHE_FILE = 'file_hashes.pkl'
+
 
 def is_environment_compatible() -> bool:
     """
@@ -60,7 +74,7 @@ def check_pver_is_built(pver_root) -> bool:
     and _bin/swb/*.a2l.\n However if we dont them in above folders,
      we can try checking in _gen/swb/module/hexmod/*.hex and _gen/swb/module/*.a2l.
     """
-    import glob
+    index = fs_index.get(pver_root)
 
     # there will be some .hex or .a2l files having these suffix. Simply ignore them.
     excluded_suffix = ["clean", "internal", "tmp", "src"]
@@ -76,7 +90,7 @@ def check_pver_is_built(pver_root) -> bool:
             return False
 
         # check for either test_PVER.hex or PVER.hex
-        hex_files = glob.glob1(swb_folder, f"*{name}*.hex")
+        hex_files = index.glob1(swb_folder, f"*{name}*.hex")
 
         # remove all invalid suffix
         for f in hex_files:
@@ -109,7 +123,7 @@ def check_pver_is_built(pver_root) -> bool:
             return False
 
         # check for either test_PVER.hex or PVER.hex
-        hex_files = glob.glob1(hexmod_folder, f"*{name}*.hex")
+        hex_files = index.glob1(hexmod_folder, f"*{name}*.hex")
 
         # remove all invalid suffix
         for f in hex_files:
@@ -146,7 +160,7 @@ def check_pver_is_built(pver_root) -> bool:
             return False
 
         # check for either test_PVER.a2l or PVER.a2l
-        a2l_files = glob.glob1(swb_folder, f"*{name}*.a2l")
+        a2l_files = index.glob1(swb_folder, f"*{name}*.a2l")
 
         # remove all invalid suffix
         for f in a2l_files:
@@ -178,7 +192,7 @@ def check_pver_is_built(pver_root) -> bool:
             return False
 
         # check for either test_PVER.a2l or PVER.a2l
-        a2l_files = glob.glob1(asap2_folder, f"*{name}*.a2l")
+        a2l_files = index.glob1(asap2_folder, f"*{name}*.a2l")
 
         # remove all invalid suffix
         for f in a2l_files:
@@ -241,18 +255,11 @@ def check_pver_is_built(pver_root) -> bool:
     logger.debug("=> This is a built PVER")
     return True
 
-def is_modified(modified_path, size, crc):
+def _size_changed(modified_path, size):
     """
-    Check the if the file is modified.
+    Cheap check of the file size against the size of the workunit database.
+    return: True/False if the size decides, None if the content must be hashed.
     """
-
-    def check_md5(file, md5):
-        """
-        Compare md5 hash of file with provided MD5.
-        """
-        import hashlib
-        return hashlib.md5(file).hexdigest().upper() == md5
-
     try:
         file_size = os.path.getsize(modified_path)
         if file_size != int(size):
@@ -263,11 +270,128 @@ def is_modified(modified_path, size, crc):
     except ValueError:
         logger.warning("Size of " + modified_path + ":\"" + size + "\" is not an integer")
         return False
+    return None
+
+
+def file_md5(file_path, chunk_size=CHUNK_SIZE) -> str:
+    """
+    MD5 of the file in upper hex, read by chunks.
+    """
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest().upper()
+
+
+class HashCache:
+    """
+    MD5 of the checked files keyed by path and validated with (mtime_ns, size),
+    an unchanged file is not hashed again by the next build.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.changed = False
+        self._lock = threading.Lock()
 
-    with open(modified_path, "rb") as file:
-        check = file.read()
-    res = check_md5(check, crc)
-    return False if res else True
+    def md5(self, file_path) -> str:
+        """
+        MD5 of the file in upper hex, hashed only if the file is unknown or changed.
+        """
+        key = os.path.normcase(os.path.abspath(file_path))
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(key)
+        if entry is not None and entry[:2] == stamp:
+            return entry[2]
+        md5 = file_md5(key)
+        with self._lock:
+            self.entries[key] = stamp + (md5,)
+            self.changed = True
+        return md5
+
+    def discard(self, file_path=None):
+        """
+        Forget the hash of the path, or every hash if no path is given.
+        """
+        with self._lock:
+            if file_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.normcase(os.path.abspath(file_path)), None)
+            self.changed = True
+
+    def save(self, cache_path: str):
+        """
+        Store the hashes on disk if they changed since the load.
+        """
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = cache_path + '.tmp'
+        with self._lock:
+            with open(temp_path, 'wb') as file:
+                pickle.dump({"version": HASH_CACHE_VERSION}, file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self.entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.changed = False
+        os.replace(temp_path, cache_path)
+
+    @classmethod
+    def load(cls, cache_path: str) -> 'HashCache':
+        """
+        Load the hashes stored by save(), an empty cache is returned if the file is missing,
+        unreadable or written by another version.
+        """
+        cache = cls()
+        if not os.path.isfile(cache_path):
+            return cache
+        try:
+            with open(cache_path, 'rb') as file:
+                header = pickle.load(file)
+                if not isinstance(header, dict) or header.get("version") != HASH_CACHE_VERSION:
+                    return cache
+                cache.entries = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                TypeError, ValueError):
+            return cls()
+        return cache
+
+
+def is_modified(modified_path, size, crc, cache: HashCache = None):
+    """
+    Check the if the file is modified.
+    """
+    changed = _size_changed(modified_path, size)
+    if changed is not None:
+        return changed
+    md5 = cache.md5(modified_path) if cache is not None else file_md5(modified_path)
+    return md5 != crc
+
+
+def modified_files(files, workers=HASH_WORKERS, cache: HashCache = None) -> Dict:
+    """
+    Check a batch of files like is_modified, the sizes are checked first and the remaining
+    files are hashed on a thread pool (hashlib releases the GIL while hashing).
+    args:
+        files : [(path, size, crc)] with the size and MD5 of the workunit database
+        cache : hashes of the previous checks, files with the same stat are not hashed again
+    return: {path: True if the file is modified}
+    """
+    result = {}
+    to_hash = {}
+    for path, size, crc in files:
+        changed = _size_changed(path, size)
+        if changed is None:
+            to_hash[path] = crc
+        else:
+            result[path] = changed
+    if to_hash:
+        hash_file = cache.md5 if cache is not None else file_md5
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, md5 in zip(to_hash, pool.map(hash_file, to_hash)):
+                result[path] = md5 != to_hash[path]
+    return result
 
 
 if __name__ == "__main__":
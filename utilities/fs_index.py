@@ -0,0 +1,257 @@
+"""
+Index of the files of a PVER.
+The PVER is walked once with os.scandir, the lookups of the build (.pm, *_pavast.xml and
+.bamf files, build outputs) are answered from the index instead of new globs and walks.
+The index of a PVER is kept for the session, see get() and invalidate(); a changed
+directory is listed again with FileIndex.update_directory(), FileIndex.refresh() finds the
+changed directories from their mtime when nothing reported them.
+"""
+import fnmatch
+import glob
+import os
+import threading
+from typing import Iterator, List
+
+from utilities.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def _list(directory: str):
+    """
+    ([sub directory names], [file names]) of the directory in listing order, None if it
+    cannot be read. Linked directories are not followed, as in os.walk.
+    """
+    sub_directories, files = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_directory = entry.is_dir()
+                    if is_directory and entry.is_symlink():
+                        continue
+                except OSError:
+                    is_directory = False
+                (sub_directories if is_directory else files).append(entry.name)
+    except OSError as exception:
+        logger.debug(f"Not indexed: {exception}")
+        return None
+    return sub_directories, files
+
+
+def _mtime(directory: str):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_hidden(name: str) -> bool:
+    # same rule as glob: names starting with a dot are only matched explicitly
+    return name.startswith('.')
+
+
+class FileIndex:
+    """
+    Files of a folder tree recorded by directory, the files by extension are derived from
+    the directories in the order of a top-down walk.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        # directory key -> ([sub directory names], [file names])
+        self.directories = {}
+        # directory key -> mtime of the directory when it was listed
+        self.mtimes = {}
+        self._extensions = None
+        self._lock = threading.RLock()
+        self._scan(root)
+
+    def _scan(self, top: str) -> List:
+        scanned = []
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            # taken before the listing, a change made meanwhile is found by the next refresh
+            mtime = _mtime(directory)
+            entry = _list(directory)
+            if entry is None:
+                continue
+            self.directories[_key(directory)] = entry
+            self.mtimes[_key(directory)] = mtime
+            scanned.append(directory)
+            # sub directories are pushed in reverse so the walk stays in listing order
+            for name in reversed(entry[0]):
+                stack.append(os.path.join(directory, name))
+        return scanned
+
+    def update_directory(self, directory: str) -> List:
+        """
+        List a changed directory again: new sub directories are walked, removed ones are
+        dropped with their content.
+        return: the directories added to the index, None if directory is not part of it
+        """
+        key = _key(directory)
+        added = []
+        with self._lock:
+            previous = self.directories.get(key)
+            if previous is None:
+                return None
+            self.mtimes[key] = _mtime(directory)
+            entry = _list(directory)
+            if entry is None:
+                entry = ([], [])
+            self.directories[key] = entry
+            for name in set(previous[0]) - set(entry[0]):
+                removed = _key(os.path.join(directory, name))
+                for other in [other for other in self.directories
+                              if other == removed or other.startswith(removed + os.sep)]:
+                    del self.directories[other]
+                    self.mtimes.pop(other, None)
+            for name in entry[0]:
+                if _key(os.path.join(directory, name)) not in self.directories:
+                    added += self._scan(os.path.join(directory, name))
+            self._extensions = None
+        return added
+
+    def refresh(self) -> List:
+        """
+        List again the directories whose mtime changed since they were listed: a directory
+        changes when a file or sub directory is added, removed or renamed in it.
+        Only the directories are checked, the files are validated by their own stat.
+        return: the directories listed again
+        """
+        changed = []
+        with self._lock:
+            for directory in list(self.walk_directories()):
+                key = _key(directory)
+                # a directory removed with its changed parent is no longer indexed
+                if key in self.directories and _mtime(directory) != self.mtimes.get(key):
+                    self.update_directory(directory)
+                    changed.append(directory)
+        return changed
+
+    @property
+    def extensions(self) -> dict:
+        """
+        extension (normcase) -> [(path, hidden)] in walk order
+        """
+        with self._lock:
+            if self._extensions is None:
+                self._extensions = self._walk_extensions()
+            return self._extensions
+
+    def _walk_extensions(self) -> dict:
+        extensions = {}
+        stack = [(self.root, False)]
+        while stack:
+            directory, hidden = stack.pop()
+            entry = self.directories.get(_key(directory))
+            if entry is None:
+                continue
+            sub_directories, files = entry
+            for name in files:
+                extension = os.path.normcase(os.path.splitext(name)[1])
+                extensions.setdefault(extension, []).append(
+                    (os.path.join(directory, name), hidden or _is_hidden(name)))
+            for name in reversed(sub_directories):
+                stack.append((os.path.join(directory, name), hidden or _is_hidden(name)))
+        return extensions
+
+    def __len__(self):
+        return sum(len(entry[1]) for entry in self.directories.values())
+
+    def files(self, directory: str) -> List:
+        """
+        Names of the files of directory, None if it is not part of the index.
+        """
+        entry = self.directories.get(_key(directory))
+        return None if entry is None else list(entry[1])
+
+    def walk_directories(self, top: str = None) -> Iterator[str]:
+        """
+        Paths of top and of the indexed directories below it, top-down like os.walk.
+        """
+        top = self.root if top is None else top
+        entry = self.directories.get(_key(top))
+        if entry is None:
+            return
+        yield top
+        for name in entry[0]:
+            yield from self.walk_directories(os.path.join(top, name))
+
+    def glob(self, pattern: str) -> List:
+        """
+        Files of the tree whose name matches pattern, like glob(root + '/**/' + pattern).
+        """
+        extension = os.path.splitext(pattern)[1]
+        if extension and not glob.has_magic(extension):
+            candidates = self.extensions.get(os.path.normcase(extension), [])
+        else:
+            candidates = [file for files in self.extensions.values() for file in files]
+        match_hidden = _is_hidden(pattern)
+        return [path for path, hidden in candidates
+                if (match_hidden or not hidden)
+                and fnmatch.fnmatch(os.path.basename(path), pattern)]
+
+    def glob1(self, directory: str, pattern: str) -> List:
+        """
+        Names of the files of directory matching pattern, like glob.glob1.
+        """
+        entry = self.directories.get(_key(directory))
+        if entry is None:
+            return glob.glob1(directory, pattern)
+        names = entry[1] + entry[0]
+        if not _is_hidden(pattern):
+            names = [name for name in names if not _is_hidden(name)]
+        return fnmatch.filter(names, pattern)
+
+    def walk(self, top: str) -> Iterator[str]:
+        """
+        Paths of the files below top in the order of os.walk(top).
+        """
+        entry = self.directories.get(_key(top))
+        if entry is None:
+            for root, _, files in os.walk(top):
+                for name in files:
+                    yield os.path.join(root, name)
+            return
+        sub_directories, files = entry
+        for name in files:
+            yield os.path.join(top, name)
+        for name in sub_directories:
+            yield from self.walk(os.path.join(top, name))
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get(root: str, refresh: bool = False) -> FileIndex:
+    """
+    Index of the folder tree of root, walked on first use or when refresh is set.
+    """
+    key = _key(root)
+    with _lock:
+        index = _indexes.get(key)
+    if index is None or refresh:
+        index = FileIndex(root)
+        with _lock:
+            _indexes[key] = index
+        logger.debug(f"{len(index)} files indexed in {root}")
+    return index
+
+
+def invalidate(root: str = None):
+    """
+    Drop the index of root, or every index if no root is given.
+    """
+    with _lock:
+        if root is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(_key(root), None)
@@ -0,0 +1,76 @@
+"""
+Ordering of names (build actions, logged commands) by their position in a reference sequence.
+The positions are computed once, sorting is then O(n log n) instead of a list.index() per key.
+"""
+import heapq
+from typing import Dict, Iterable, List
+
+
+class OrderedRegistry:
+    """
+    Position of every name of a reference sequence, the first occurrence of a name counts
+    like in list.index(). Unknown names are ordered with the last name of the sequence.
+    """
+
+    def __init__(self, names: Iterable):
+        self.names = list(names)
+        self.positions = {}
+        for position, name in enumerate(self.names):
+            self.positions.setdefault(name, position)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def position(self, name) -> int:
+        """
+        Position of the name in the sequence, the last position for an unknown name
+        """
+        return self.positions.get(name, len(self.names) - 1)
+
+    def sort(self, names: Iterable) -> List:
+        """
+        Names in the order of the sequence, the sort is stable
+        """
+        return sorted(names, key=self.position)
+
+    def topological_sort(self, names: Iterable, predecessors: Dict[str, Iterable]) -> List:
+        """
+        Names in the order of the sequence, moved after their predecessors when needed.
+        Only the predecessors which are part of names are considered, names in a cycle
+        keep the order of the sequence.
+        """
+        ordered = self.sort(names)
+        rank = {}
+        for position, name in enumerate(ordered):
+            rank.setdefault(name, position)
+        successors = [[] for _ in ordered]
+        pending = [0] * len(ordered)
+        for position, name in enumerate(ordered):
+            for predecessor in set(predecessors.get(name, ())):
+                before = rank.get(predecessor)
+                if before is not None and before != position:
+                    successors[before].append(position)
+                    pending[position] += 1
+
+        ready = [position for position, count in enumerate(pending) if count == 0]
+        heapq.heapify(ready)
+        done = [False] * len(ordered)
+        result = []
+        while len(result) < len(ordered):
+            if not ready:
+                # cycle: release the first name of the sequence still waiting
+                ready.append(next(position for position, finished in enumerate(done)
+                                  if not finished))
+            position = heapq.heappop(ready)
+            if done[position]:
+                continue
+            done[position] = True
+            result.append(ordered[position])
+            for successor in successors[position]:
+                pending[successor] -= 1
+                if pending[successor] == 0:
+                    heapq.heappush(ready, successor)
+        return result
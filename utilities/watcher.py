@@ -0,0 +1,112 @@
+"""
+Watcher of the source tree of the loaded PVER.
+The directories of the PVER are watched with QFileSystemWatcher, a changed directory is
+recorded in a dirty set. At build time only the dirty directories are listed again in the
+file index and the hashes and parsed documents of their added or removed files are dropped.
+The content of the files is validated by their (mtime, size) when they are read.
+Without a watcher FileIndex.refresh() finds the changed directories from their mtime.
+"""
+import os
+from typing import List
+from PySide6.QtCore import QFileSystemWatcher, QObject
+
+from tools import doc_cache
+from utilities import fs_index
+from utilities.check import HashCache
+from utilities.log import get_logger
+
+logger = get_logger(__name__)
+
+# set to False to rely only on the validation done at build time
+ENABLED = True
+# larger trees are not watched, each watched directory costs an OS handle
+MAX_PATHS = 8192
+
+
+def _is_output(root: str, directory: str) -> bool:
+    # _gen, _bin, _out, _smb, ... are written by the build itself
+    relative = os.path.relpath(directory, root)
+    return relative != os.curdir and relative.split(os.sep)[0].startswith('_')
+
+
+class PverWatcher(QObject):
+    """
+    Record the changed directories of a PVER and bring the file index and the caches up to
+    date with them before a build, see flush().
+    """
+
+    def __init__(self, root: str, hash_cache: HashCache, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.hash_cache = hash_cache
+        # directories with added, removed or renamed entries since the last flush
+        self.dirty = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.on_directory_changed)
+
+    def _watch(self, directories):
+        directories = [directory for directory in directories
+                       if not _is_output(self.root, directory)]
+        if directories:
+            self._watcher.addPaths(directories)
+
+    def start(self) -> bool:
+        """
+        Watch the directories of the source tree of the PVER.
+        return: False if the tree has too many directories to be watched
+        """
+        index = fs_index.get(self.root)
+        directories = [directory for directory in index.walk_directories()
+                       if not _is_output(self.root, directory)]
+        if len(directories) > MAX_PATHS:
+            logger.info(f"{len(directories)} directories in {self.root}, not watched")
+            return False
+        self._watcher.addPaths(directories)
+        logger.debug(f"Watching {len(directories)} directories of {self.root}")
+        return True
+
+    def stop(self):
+        """
+        Stop watching.
+        """
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
+
+    def on_directory_changed(self, directory: str):
+        """
+        A file or sub directory of directory was added, removed or renamed.
+        """
+        self.dirty.add(directory)
+
+    def flush(self) -> List:
+        """
+        List the dirty directories again, watch their new sub directories and forget the
+        hashes and parsed documents of their added or removed files.
+        return: the added or removed files
+        """
+        index = fs_index.get(self.root)
+        changed = []
+        dirty, self.dirty = self.dirty, set()
+        for directory in sorted(dirty):
+            previous = set(index.files(directory) or [])
+            added = index.update_directory(directory)
+            if added is None:
+                # removed with a parent listed before
+                continue
+            self._watch(added)
+            for name in previous ^ set(index.files(directory) or []):
+                changed.append(os.path.join(directory, name))
+            for new_directory in added:
+                changed += [os.path.join(new_directory, name)
+                            for name in index.files(new_directory) or []]
+        for path in changed:
+            self.discard(path)
+        return changed
+
+    def discard(self, path: str):
+        """
+        Forget the hash and the parsed document of a changed file.
+        """
+        self.hash_cache.discard(path)
+        doc_cache.documents.invalidate(path)
@@ -0,0 +1,276 @@
+"""
+Item model of the PVER tree.
+The artifacts are read from the ArtifactTable, a level of nodes is only created when it is
+needed (expanded in the view or reached by a check state change), the check states live
+in the nodes instead of in widget items.
+"""
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
+
+from utilities.artifact_table import ArtifactTable
+
+HEADERS = ["Name", "Class", "Variant"]
+
+# artifacts of the other classes are loaded but not shown
+CLASS_NAMES = ["BC", "MC", "FC", "GC", "BX", "MX", "GX",
+               "FX", "CEL", "CC", "GENC", "FSY", "PJT"]
+
+
+def is_shown(cls: str) -> bool:
+    """
+    Check if an artifact of the class is shown in the tree
+    """
+    for name in CLASS_NAMES:
+        if name in cls:
+            return True
+    return False
+
+
+def is_mandatory(name: str, cls: str) -> bool:
+    """
+    Check if the artifact is always part of the build (checked and locked in the tree)
+    """
+    return 'SWAdp' in name or cls in ['CEL', 'GENC']
+
+
+def children_state(states) -> Qt.CheckState:
+    """
+    Check state of a parent from the states of its shown children
+    """
+    if Qt.Checked not in states and Qt.PartiallyChecked not in states:
+        return Qt.Unchecked
+    if Qt.Unchecked not in states and Qt.PartiallyChecked not in states:
+        return Qt.Checked
+    return Qt.PartiallyChecked
+
+
+class ArtifactNode:
+    """
+    Node of an artifact in the tree, the artifact itself is the row of the ArtifactTable.
+    """
+    __slots__ = ("artifact", "parent", "row", "children", "visible", "check",
+                 "hidden", "locked", "fetched")
+
+    def __init__(self, artifact, table, parent):
+        self.artifact = artifact
+        self.parent = parent
+        self.row = -1
+        self.children = None
+        self.visible = None
+        self.check = Qt.Unchecked
+        self.hidden = parent is not None and artifact not in table.matching(is_shown, "cls")
+        self.locked = parent is not None and \
+            (parent.locked or artifact in table.matching(is_mandatory, "name", "cls"))
+        self.fetched = False
+        if self.locked:
+            self.check = Qt.Checked
+
+
+class PverTreeModel(QAbstractItemModel):
+    """
+    Lazy tree model of the PVER artifacts.
+    check_changed is emitted with the node whenever the check state of an artifact changes.
+    """
+    check_changed = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = ArtifactTable()
+        self.root = ArtifactNode(-1, self.table, None)
+        self.enabled = True
+
+    def load(self, table: ArtifactTable):
+        """
+        Replace the content of the model by the artifacts of the table.
+        Only the levels leading to mandatory artifacts are materialized, no signal is emitted
+        for their check states.
+        """
+        # the view may still look at the previous nodes until the reset is done
+        previous = self.root
+        self.beginResetModel()
+        self.table = table
+        self.root = ArtifactNode(-1, table, None)
+        self.children(self.root)
+        self.root.fetched = True
+        self.enabled = True
+        self._check_mandatory()
+        self.endResetModel()
+        del previous
+
+    def _check_mandatory(self):
+        nodes = {}
+        parents = []
+        for artifact in sorted(self.table.matching(is_mandatory, "name", "cls")):
+            path = self._path(artifact)
+            if path is None:
+                continue
+            node = self.root
+            for row in path:
+                lookup = nodes.get(id(node))
+                if lookup is None:
+                    lookup = nodes[id(node)] = {child.artifact: child
+                                                for child in self.children(node)}
+                    parents.append(node)
+                node = lookup[row]
+        # parents are discovered top-down, update their states bottom-up
+        for node in reversed(parents):
+            if node is not self.root:
+                node.check = children_state([child.check for child in node.visible])
+
+    def _path(self, artifact):
+        """
+        Rows from the top level down to the artifact, None if the artifact is below a
+        temporary artifact or already checked with a mandatory ancestor.
+        """
+        table = self.table
+        mandatory = table.matching(is_mandatory, "name", "cls")
+        path = [artifact]
+        if table.upd[artifact] == 'TEMPORARY':
+            return None
+        parent = table.parent[artifact]
+        while parent >= 0:
+            if table.upd[parent] == 'TEMPORARY' or parent in mandatory:
+                return None
+            path.append(parent)
+            parent = table.parent[parent]
+        path.reverse()
+        return path
+
+    def children(self, node: ArtifactNode) -> list:
+        """
+        All children of the node (hidden ones included), creating the nodes if needed.
+        The new nodes are unchecked unless locked, checking the parent checks them through
+        check_changed.
+        """
+        if node.children is None:
+            node.children = []
+            node.visible = []
+            for artifact in self.table.children(node.artifact):
+                if self.table.upd[artifact] == 'TEMPORARY':
+                    continue
+                child = ArtifactNode(artifact, self.table, node)
+                node.children.append(child)
+                if not child.hidden:
+                    child.row = len(node.visible)
+                    node.visible.append(child)
+        return node.children
+
+    def children_state(self, node: ArtifactNode) -> Qt.CheckState:
+        """
+        Check state of the node computed from its shown children
+        """
+        self.children(node)
+        return children_state([child.check for child in node.visible])
+
+    def set_check_state(self, node: ArtifactNode, state: Qt.CheckState):
+        """
+        Change the check state of the node and notify the view and check_changed
+        """
+        if node.check == state:
+            return
+        node.check = state
+        if not node.hidden and node.parent.fetched:
+            index = self.createIndex(node.row, 0, node)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_changed.emit(node)
+
+    def set_enabled(self, enabled: bool):
+        """
+        Enable or disable the user interaction with every artifact
+        """
+        self.enabled = enabled
+        self.layoutAboutToBeChanged.emit()
+        self.layoutChanged.emit()
+
+    def node(self, index: QModelIndex) -> ArtifactNode:
+        """
+        Node of the index, the root node for an invalid index
+        """
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if not node.fetched or not 0 <= row < len(node.visible) or not 0 <= column < len(HEADERS):
+            return QModelIndex()
+        return self.createIndex(row, column, node.visible[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.node(parent)
+        return len(node.visible) if node.fetched else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        node = self.node(parent)
+        if node.visible is not None:
+            return bool(node.visible)
+        table = self.table
+        shown = table.matching(is_shown, "cls")
+        return any(table.upd[artifact] != 'TEMPORARY' and artifact in shown
+                   for artifact in table.children(node.artifact))
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return not node.fetched and self.hasChildren(parent)
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        if node.fetched:
+            return
+        self.children(node)
+        if node.visible:
+            self.beginInsertRows(parent, 0, len(node.visible) - 1)
+            node.fetched = True
+            self.endInsertRows()
+        else:
+            node.fetched = True
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return (self.table.name, self.table.cls, self.table.variant)[column][node.artifact]
+        if role == Qt.CheckStateRole and column == 0:
+            return node.check
+        if role == Qt.ToolTipRole and column == 0 \
+                and node.artifact in self.table.matching(is_mandatory, "name", "cls"):
+            return "This artifact is required"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        self.set_check_state(index.internalPointer(), Qt.CheckState(value))
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        if self.enabled and not index.internalPointer().locked:
+            flags |= Qt.ItemIsEnabled
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
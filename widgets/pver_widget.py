@@ -3,7 +3,6 @@ TODO: Write Docstring
 """
 import os
 import re
-import glob
 import pathlib
 import sqlite3
 import sys
@@ -18,16 +17,18 @@ from PySide6.QtWidgets import (
     QGridLayout,
     QGroupBox,
     QMessageBox, QPushButton,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QProgressBar,
     QHBoxLayout,
     QWidget
 )
 from tools import bct, rtegen, damos
-from utilities.check import check_pver_is_built, is_modified
+from utilities import artifact_table, fs_index, watcher
+from utilities.artifact_table import ArtifactTable
+from utilities.check import HASH_CACHE_FILE, HashCache, check_pver_is_built, modified_files
 from utilities.log import get_logger, setup_logger
 from utilities.profiler import profiling
+from .pver_model import PverTreeModel
 
 logger = get_logger(__name__)
 TEALEAVES_PATH = os.path.join("C:\\toolbase\\tealeaves")
@@ -42,7 +43,7 @@ class BrowseDialog(QFileDialog):
         """
         DialogSignal is a QObject that allows the BrowseDialog to emit signals
         """
-        build_pver = Signal(bool, object)
+        build_pver = Signal(bool, object, list)
         fetch_tools = Signal(str)
 
     def __init__(self):
@@ -63,13 +64,13 @@ class BrowseDialog(QFileDialog):
             self.worker.signal.error.connect(self.on_error)
             thread_pool.start(self.worker)
 
-    def on_result(self,permit, path, tree):
+    def on_result(self,permit, path, tree, arxml_files):
         """
         on_result is a Slot that is called when the worker thread emits a result signal
         """
         self.signal.fetch_tools.emit(path)
         # noinspection PyUnresolvedReferences
-        self.signal.build_pver.emit(permit, tree)
+        self.signal.build_pver.emit(permit, tree, arxml_files)
         # noinspection PyUnresolvedReferences
 
     def on_finish(self):
@@ -102,7 +103,7 @@ class PverLoadWorker(QRunnable):
         WorkerSignal is a QObject that allows the PverLoadWorker to emit signals
         """
         finished = Signal()
-        result = Signal(bool, str, dict)
+        result = Signal(bool, str, object, list)
         error = Signal(tuple)
 
     def __init__(self, path):
@@ -111,7 +112,6 @@ class PverLoadWorker(QRunnable):
         self.signal = self.WorkerSignal()
         self.conn = None
         self.cursor = None
-        self.arxml_files = []
         self.build = True
 
     @Slot()
@@ -121,13 +121,15 @@ class PverLoadWorker(QRunnable):
         """
         # noinspection PyBroadException
         try:
+            # walk the PVER once, the checks and the build look files up in the index
+            fs_index.get(self.path, refresh=True)
             if not check_pver_is_built(self.path):
                 self.build = False
                 logger.error("=> PVER is not built")
             if not self.is_supported():
                 logger.error("MDGB Version is incompatibility")
                 self.build = False
-            result = self.load_pver()
+            result, arxml_files = self.load_pver()
         except Exception as e:
             # traceback.print_exc()
             exec_type, value = sys.exc_info()[:2]
@@ -135,7 +137,7 @@ class PverLoadWorker(QRunnable):
             self.signal.error.emit(exec_type, value, traceback.format_exc())
         else:
             # noinspection PyUnresolvedReferences
-            self.signal.result.emit(self.build, self.path, result)
+            self.signal.result.emit(self.build, self.path, result, arxml_files)
             # noinspection PyUnresolvedReferences
         finally:
             # noinspection PyUnresolvedReferences
@@ -155,69 +157,80 @@ class PverLoadWorker(QRunnable):
 
     def load_pver(self):
         """
-        Connect and fetch SQLite data
+        Connect and fetch SQLite data, the result is cached under _smb/pver
+        until the workunit database changes.
+        :return: (artifact table, arxml files)
         """
         logger.critical("PVER Loading.")
-        self.conn = sqlite3.connect(str(pathlib.Path(self.path).joinpath("workunit.lws.cc.db3")))
+        database = str(pathlib.Path(self.path).joinpath("workunit.lws.cc.db3"))
+        cache_path = os.path.join(self.path, '_smb', 'pver', artifact_table.CACHE_FILE)
+        stamp = artifact_table.database_stamp(database)
+        result = artifact_table.load_cache(cache_path, stamp)
+        if result is not None:
+            logger.critical("Pver Loaded from cache.")
+            return result
+
+        self.conn = sqlite3.connect(database)
         self.cursor = self.conn.cursor()
         result = self.fetch()
         self.cursor.close()
         self.conn.close()
+        try:
+            artifact_table.save_cache(cache_path, stamp, *result)
+        except OSError as exception:
+            logger.warning(f"PVER load cache not written: {exception}")
 
         logger.critical("Pver Loaded.")
         return result
 
     def fetch(self, current_id=1):
         """
-        Fetch all artifacts and their children using recursion
+        Fetch all artifacts and their children with two set-based queries
+        into an ArtifactTable.
+        :return: (artifact table, arxml files required by RTEGEN without duplicates,
+                  in the order of the tree)
         """
-        children = self.get_children(current_id)
-        children_dict = {}
-        for child in children:
-            child = child[0]
-            cls, name, variant, Upd, file_name, path, ext, size, crc, a_paths = self.get_detail(child)
-            children_dict[name] = {"cls": cls, "variant": variant, "Upd": Upd, "f_name": file_name,
-                                   "path": path, "ext": ext, "size": str(size),
-                                   "crc": crc, "arxmls": a_paths}
-            children_dict[name]["children"] = self.fetch(child)
-        return children_dict
+        table = ArtifactTable.from_rows(self.get_relations(), self.get_details(), current_id)
+        arxml_files = {}
+        for row in sorted(table.matching(rtegen.is_required, "cls", "ext")):
+            if table.f_name[row] and table.ext[row]:
+                arxml_files.setdefault(table.path[row])
+        return table, list(arxml_files)
 
-    def get_children(self, parent_id):
+    def get_relations(self):
         """
-        Get children of an artifact
-        :param parent_id: id of the parent artifact
+        Get the children of every artifact, ordered by class and name
+        :return: {parent_id: [child_id]}
         """
         self.cursor.execute(
-            "SELECT r.ChildId "
+            "SELECT r.ParentId, r.ChildId "
             "FROM Relations as r, Artifacts as a "
-            "WHERE r.ChildId = a.Id and r.ParentId =? "
-            "ORDER BY a.Class, a.Name",
-            [parent_id])
+            "WHERE r.ChildId = a.Id "
+            "ORDER BY r.ParentId, a.Class, a.Name")
 
-        children = self.cursor.fetchall()
-        return children
+        relations = {}
+        for parent_id, child_id in self.cursor:
+            relations.setdefault(parent_id, []).append(child_id)
+        return relations
 
-    def get_detail(self, artifact_id):
+    def get_details(self):
         """
-        Get detail of an artifact
-        :param artifact_id: id of the artifact
+        Get detail of every artifact, only the first file of an artifact is kept
+        :return: {artifact_id: (cls, name, variant, Upd, file_name, path, ext, size, crc)}
         """
-
         self.cursor.execute(
-            "SELECT a.Class, a.Name, a.Variant, a.Upd, f.Name, "
+            "SELECT a.Id, a.Class, a.Name, a.Variant, a.Upd, f.Name, "
             "f.FilePath, f.Extension,f.FileSize, f.CRC "
             "FROM Artifacts as a "
             "LEFT OUTER JOIN Files as f "
             "ON a.Id = f.ArtifactId "
-            "WHERE a.Id=? ",
-            [artifact_id])
-        cls, name, variant, Upd, file_name, path, ext, size, crc = self.cursor.fetchall()[0]
-        if file_name and ext:
-            file_name = "{}.{}".format(file_name, ext)
-            path = os.path.join(path, file_name)
-            if rtegen.is_required(cls, ext):
-                self.arxml_files.append(path)
-        return cls, name, variant, Upd, file_name, path, ext, size, crc, self.arxml_files
+            "ORDER BY a.Id")
+
+        details = {}
+        for row in self.cursor:
+            if row[0] not in details:
+                details[row[0]] = row[1:]
+        return details
 
 
 class BuildToolWorker(QRunnable):
@@ -293,17 +306,17 @@ class PVERTreeWidget(QGroupBox):
         self.thread_pool = QThreadPool().globalInstance()
         self.arxml_paths = []
 
-        self.pver_tree = QTreeWidget()
-        self.pver_tree.setHeaderLabels(["Name", "Class", "Variant"])
+        self.pver_model = PverTreeModel()
+        self.pver_tree = QTreeView()
+        self.pver_tree.setModel(self.pver_model)
         self.pver_tree.setColumnWidth(0, int(self.PVER_TREE_WIDTH * 3 / 6))
         self.pver_tree.setColumnWidth(1, int(self.PVER_TREE_WIDTH * 1 / 6))
         self.pver_tree.setColumnWidth(2, int(self.PVER_TREE_WIDTH * 1 / 6))
 
 
-        self.pver_tree.setSelectionMode(QTreeWidget.SingleSelection)
-        self.pver_tree.itemClicked.connect(self.on_item_clicked)
-        self.pver_tree.itemChanged.connect(self.on_item_changed)
-        self.tree_items = []
+        self.pver_tree.setSelectionMode(QTreeView.SingleSelection)
+        self.pver_tree.clicked.connect(self.on_item_clicked)
+        self.pver_model.check_changed.connect(self.on_item_changed)
         self.allow_change = True
 
         self.signal = self.QSignal()
@@ -345,6 +358,9 @@ class PVERTreeWidget(QGroupBox):
         self.process_running = False
 
         self.file_check = []
+        self.pending_files = []
+        self.hash_cache = HashCache()
+        self.watcher = None
         self.mandatory_paths = []
         self.process_list = []
 
@@ -389,62 +405,42 @@ class PVERTreeWidget(QGroupBox):
         tree_layout.addWidget(self.pver_tree, 2, 0, 1, 4)
 
     @profiling()
-    def build_tree(self, permit, data):
+    def build_tree(self, permit, table, arxml_paths):
         """
-        Clear the pver tree then build the tree widget from the data.
+        Clear the pver tree then load the artifact table into the tree model,
+        the levels of the tree are created when they are expanded.
         """
-        self.tree_items = []
         self.allow_change = True
-        self.pver_tree.blockSignals(True)
-        self.pver_tree.clear()
         self.tealeaves_run = False
         self.selected_rtegen_artifacts.clear()
         self.selected_btc_artifacts.clear()
         self.selected_damos_artifacts.clear()
-        self.build(self.pver_tree, data)
-        self.pver_tree.blockSignals(False)
+        self.arxml_paths = arxml_paths
+        self.pver_model.load(table)
+        self.hash_cache = HashCache.load(self.hash_cache_path())
+        self.watch_pver()
         self.build_button.setDisabled(False)
         self.check_button.setDisabled(False)
         self.setTitle(f"PVER TREE: {self.base_path.split('/')[-1]}")
         if not permit:
             self.tree_set_disable()
 
-    # "Name", "cls", "variant",  "f_name", "path", "ext", "size", "crc"
-    def build(self, parent=None, data=None, check_state=Qt.Unchecked):
-        """
-        Build the tree widget from the data using recursion
-        """
-        class_name =  ["BC", "MC", "FC", "GC", "BX", "MX", "GX",
-                      "FX", "CEL", "CC", "GENC", "FSY", "PJT"]
-
-        for key, value in data.items():
-            self.arxml_paths = value["arxmls"]
-            if value["Upd"] != 'TEMPORARY':
-                is_checked = check_state
-                widget = QTreeWidgetItem(parent,
-                                         [key,value["cls"],value["variant"],
-                                          value["f_name"], value["path"], value["ext"],
-                                          value["size"], value["crc"]])
-                widget.setCheckState(0, is_checked)
-                # check if the artifact should be hidden
-                is_showed = False
-                for name in class_name:
-                    if name in value["cls"]:
-                        is_showed = True
-                        break
-
-                if not is_showed:
-                    widget.setHidden(True)
-                # get required artifacts
-                if 'SWAdp' in key or value["cls"] in ['CEL', 'GENC']:
-                    widget.setCheckState(0, Qt.Checked)
-                    widget.setToolTip(0, "This artifact is required")
-                    is_checked = Qt.Checked
-                    widget.setDisabled(True)
-                    self.set_parent_state(widget)
-                if "children" in value:
-                    self.build(widget, value["children"], is_checked)
-                self.tree_items.append(widget)
+    def watch_pver(self):
+        """
+        Watch the source tree of the loaded PVER, the changed directories are brought up to
+        date in the file index when a build starts.
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
+        if not watcher.ENABLED:
+            return
+        self.watcher = watcher.PverWatcher(self.base_path, self.hash_cache, self)
+        if not self.watcher.start():
+            self.watcher.deleteLater()
+            self.watcher = None
+
     def on_browse(self):
         """
         Open a file dialog to browse for a PVER.
@@ -468,79 +464,64 @@ class PVERTreeWidget(QGroupBox):
         """
         Set the state of the parent of the item.
         """
-        parent = current_item.parent()
-        if parent:
-            states = []
-            for i in range(parent.childCount()):
-                child = parent.child(i)
-                if not child.isHidden():
-                    state = parent.child(i).checkState(0)
-                    states.append(state)
-            if Qt.Checked not in states and Qt.PartiallyChecked not in states:
-                parent.setCheckState(0, Qt.Unchecked)
-            elif Qt.Unchecked not in states and Qt.PartiallyChecked not in states:
-                parent.setCheckState(0, Qt.Checked)
-            else:
-                parent.setCheckState(0, Qt.PartiallyChecked)
+        parent = current_item.parent
+        if parent is not None and parent is not self.pver_model.root:
+            self.pver_model.set_check_state(parent, self.pver_model.children_state(parent))
             self.set_parent_state(parent)
 
-    def on_item_clicked(self, item):
+    def on_item_clicked(self, index):
         """
         Handle the user clicking on an item in the tree.
         """
-        self.set_parent_state(item)
+        self.set_parent_state(self.pver_model.node(index))
 
-    # "Name", "cls", "variant",  "f_name", "path", "ext", "size", "crc"
     def on_item_changed(self, item):
         """
         Handle the user changing the state of an item in the tree.
         """
         if self.allow_change:
+            state = item.check
+            table = self.pver_model.table
+            artifact = item.artifact
             # Set child item's state if current item is check/unchecked
-            if item.checkState(0) != Qt.PartiallyChecked and item.childCount() > 0:
-                for j in range(item.childCount()):
-                    item.child(j).setCheckState(0, item.checkState(0))
+            if state != Qt.PartiallyChecked:
+                for child in self.pver_model.children(item):
+                    self.pver_model.set_check_state(child, state)
 
             # Get required files for build tools
-            if item.checkState(0) == Qt.Checked:
-                if rtegen.is_required(item.text(1), item.text(5)):
+            if state == Qt.Checked:
+                if artifact in table.matching(rtegen.is_required, "cls", "ext"):
                     self.selected_rtegen_artifacts.append(item)
 
-                if bct.is_required(item.text(1), item.text(5)):
-                    if item.text(1) == "BC":
+                if artifact in table.matching(bct.is_required, "cls", "ext"):
+                    if table.cls[artifact] == "BC":
                         self.selected_btc_artifacts.append(item)
                     self.selected_btc_artifacts.append(item)
 
-                if damos.is_required(item.text(1), item.text(3)):
+                if artifact in table.matching(damos.is_required, "cls", "f_name"):
                     self.selected_damos_artifacts.append(item)
             # Remove files from build tools if not check
             else:
-                if rtegen.is_required(item.text(1), item.text(5)):
+                if item in self.selected_rtegen_artifacts:
                     self.selected_rtegen_artifacts.remove(item)
 
-                if damos.is_required(item.text(1), item.text(3)):
+                if item in self.selected_damos_artifacts:
                     self.selected_damos_artifacts.remove(item)
                     self.damos_file_paths["modified_path"].clear()
 
-                if bct.is_required(item.text(1), item.text(5)):
-                    if item.text(1) == "BC":
-                        self.selected_btc_artifacts.remove(item)
+                while item in self.selected_btc_artifacts:
                     self.selected_btc_artifacts.remove(item)
 
     def tree_set_disable(self):
         self.allow_change = False
         self.build_button.setDisabled(True)
         self.check_button.setDisabled(True)
-        if self.tree_items:
-            for item in self.tree_items:
-                item.setDisabled(True)
+        self.pver_model.set_enabled(False)
 
     def tree_set_enable(self):
         self.build_button.setEnabled(True)
         self.check_button.setEnabled(True)
-        if self.tree_items:
-            for item in self.tree_items:
-                item.setDisabled(False)
+        self.pver_model.set_enabled(True)
         self.allow_change = True
 
     def stop_process(self):
@@ -579,27 +560,124 @@ class PVERTreeWidget(QGroupBox):
     def on_build_pver(self):
         """
         Build the PVER.
+        The selected files are checked for modification on the thread pool,
+        the build continues in on_files_checked.
         """
         self.total_command.clear()
         self.command_list.clear()
         self.mandatory_paths.clear()
 
+        def check_file(file_path):
+            """
+            Check if the file path is valid.
+            return: None if the file exists (its content decides), else the choice of the user
+            """
+            if not os.path.exists(file_path):
+                logger.error(f"File path does not exist: {file_path}")
+                button = QMessageBox.warning(self, "File path does not exist",
+                                             "File path does not exist: {}, \n "
+                                             "Is it new file?".format(file_path),
+                                             QMessageBox.Yes | QMessageBox.Ignore | QMessageBox.Cancel)
+                if button == QMessageBox.Cancel:
+                    raise FileNotFoundError(f"File path does not exist: {file_path}")
+
+                elif button == QMessageBox.Ignore:
+                    logger.warning(f"Ignoring file: {file_path}")
+                    return False
+                elif button == QMessageBox.Yes:
+                    logger.debug(f"Add file to build: {file_path} (not found in db3)")
+                    return True
+            return None
+
+        # Check if the selected items was modified
+        logger.debug("Checking if the selected items was modified")
+        table = self.pver_model.table
+        self.pending_files.clear()
+        try:
+            # Query all the arxml paths inside the PVER path
+            for item in self.arxml_paths:
+                self.rtegen_file_paths["arxml_path"]. \
+                    append(os.path.join(self.base_path, item).replace("\\", "/"))
+
+            for tool, selected in (("rtegen", self.selected_rtegen_artifacts),
+                                   ("bct", self.selected_btc_artifacts)):
+                for node in selected:
+                    item = table.record(node.artifact)
+                    if not item.f_name or not item.path:
+                        # artifacts without a file row in the workunit database
+                        logger.warning(f"No file for the artifact {item.name}, skipped")
+                        continue
+                    path = os.path.join(self.base_path, item.path).replace("\\", "/")
+                    self.pending_files.append((tool, item, path, check_file(path)))
+        except FileNotFoundError as exception:
+            logger.error(exception)
+            logger.error("Cancel build pver")
+            return
+
+        files = [(path, item.size, item.crc)
+                 for _, item, path, decision in self.pending_files if decision is None]
+        if self.watcher is not None:
+            changed = self.watcher.flush()
+            logger.debug(f"{len(changed)} files added or removed since the last build")
+        self.build_button.setDisabled(True)
+        check_worker = BuildToolWorker(self.check_files, files)
+        check_worker.signals.result.connect(self.on_files_checked)
+        check_worker.signals.error.connect(self.on_files_check_error)
+        self.threadpool.start(check_worker)
+
+    def hash_cache_path(self):
+        """
+        File keeping the hashes of the checked files of the current PVER.
+        """
+        return os.path.join(self.base_path, '_smb', 'pver', HASH_CACHE_FILE)
+
+    def check_files(self, files):
+        """
+        Modification check of the files (run on the thread pool),
+        the hashes are kept for the next build.
+        """
+        if self.watcher is None:
+            # nothing reported the changed directories since the PVER was loaded
+            fs_index.get(self.base_path).refresh()
+        result = modified_files(files, cache=self.hash_cache)
+        try:
+            self.hash_cache.save(self.hash_cache_path())
+        except OSError as exception:
+            logger.warning(f"File hashes not saved: {exception}")
+        return result
+
+    def on_files_check_error(self, error):
+        """
+        The modification check failed (e.g. a selected file was removed meanwhile).
+        """
+        logger.error(error[1])
+        logger.error("Cancel build pver")
+        self.pending_files.clear()
+        self.build_button.setEnabled(True)
+
+    def on_files_checked(self, modified):
+        """
+        Collect the files of the tools from the result of the modification check
+        then start the build.
+        """
+        table = self.pver_model.table
+        index = fs_index.get(self.base_path)
+
         def get_bamf_file(path):
             """
             get all the .bamf in current working PVER directory
             """
-            for root, dirs, files in os.walk(os.path.dirname(path)):
-                for file in files:
-                    check_file = os.path.join(root, file).replace("\\", "/")
-                    if '.bamf' in check_file:
-                        return check_file
+            for check_file in index.walk(os.path.dirname(path)):
+                check_file = check_file.replace("\\", "/")
+                if '.bamf' in check_file:
+                    return check_file
 
         def get_pm_files(path):
             """
             get all the .pm in current working PVER directory
             """
             list_of_files = []
-            files = glob.glob(path + '/**/*.pm', recursive=True)
+            files = index.glob('*.pm')
             for file in files:
                 list_of_files.append(file.replace('\\', '/'))
             return list_of_files
@@ -610,7 +688,7 @@ class PVERTreeWidget(QGroupBox):
             """
             list_of_files = []
             mandatory_paths = []
-            files = glob.glob(path + '/**/*_pavast.xml', recursive=True)
+            files = index.glob('*_pavast.xml')
             for file in files:
                 format_file = file.replace('\\', '/').split(self.base_path)[1]
                 name = format_file.split('/', 1)[1]
@@ -628,67 +706,36 @@ class PVERTreeWidget(QGroupBox):
             list_of_files = [files for files in os.listdir(path) if '.cfg' in files]
             return [os.path.join(path, file) for file in list_of_files]
 
-        def check_file(file_path, size, crc):
-            """
-            Check if the file path is valid.
-            """
-            if not os.path.exists(file_path):
-                logger.error(f"File path does not exist: {file_path}")
-                button = QMessageBox.warning(self, "File path does not exist",
-                                             "File path does not exist: {}, \n "
-                                             "Is it new file?".format(file_path),
-                                             QMessageBox.Yes | QMessageBox.Ignore | QMessageBox.Cancel)
-                if button == QMessageBox.Cancel:
-                    raise FileNotFoundError(f"File path does not exist: {file_path}")
-
-                elif button == QMessageBox.Ignore:
-                    logger.warning(f"Ignoring file: {file_path}")
-                    return False
-                elif button == QMessageBox.Yes:
-                    logger.debug(f"Add file to build: {file_path} (not found in db3)")
-                    return True
-
-            if is_modified(file_path, size, crc):
-                return True
-
-            return False
-
-        # Check if the selected items was modified
-        logger.debug("Checking if the selected items was modified")
         try:
-            # Query all the arxml paths inside the PVER path
-            for item in self.arxml_paths:
-                self.rtegen_file_paths["arxml_path"]. \
-                    append(os.path.join(self.base_path, item).replace("\\", "/"))
-
-            for item in self.selected_rtegen_artifacts:
-                path = os.path.join(self.base_path, item.text(4)).replace("\\", "/")
-                if check_file(path, item.text(6), item.text(7)):
-                    self.rtegen_file_paths["modified_path"].append(
-                        os.path.join(self.base_path, item.text(4)).replace("\\", "/"))
-
-            for item in self.selected_btc_artifacts:
-                path = os.path.join(self.base_path, item.text(4)).replace("\\", "/")
-                if check_file(path, item.text(6), item.text(7)):
-
-                    if (item.text(1).startswith('CONF') or item.text(1).startswith('XD')) \
-                            and (item.text(5) == 'xml' or item.text(5) == 'arxml'):
-                        self.bct_artifacts["arxml_path"].append(path)
-                        get_path = get_bamf_file(path)
-                        self.bct_artifacts["modified_path"].append(path)
-                        if get_path is not None and get_path not in self.bct_artifacts["bamf_path"]:
-                            self.bct_artifacts["modified_path"].append(get_path)
-
-                    if (item.text(1).startswith('CONF') or item.text(1) == 'BAMF') and item.text(
-                            5) != 'xml' and item.text(5) != 'arxml':  # look for all bamf files
-                        get_path = get_bamf_file(path)
-                        if get_path is not None \
-                                and get_path not in self.bct_artifacts["bamf_path"]:
-                            self.bct_artifacts["bamf_path"].append(get_path)
-                            self.bct_artifacts["modified_path"].append(get_path)
-
-            for item in self.selected_damos_artifacts:
-                self.damos_file_paths["modified_path"].append(item.text(4).replace("\\", "/"))
+            for tool, item, path, decision in self.pending_files:
+                if not (modified[path] if decision is None else decision):
+                    continue
+
+                if tool == "rtegen":
+                    self.rtegen_file_paths["modified_path"].append(path)
+                    continue
+
+                if (item.cls.startswith('CONF') or item.cls.startswith('XD')) \
+                        and (item.ext == 'xml' or item.ext == 'arxml'):
+                    self.bct_artifacts["arxml_path"].append(path)
+                    get_path = get_bamf_file(path)
+                    self.bct_artifacts["modified_path"].append(path)
+                    if get_path is not None and get_path not in self.bct_artifacts["bamf_path"]:
+                        self.bct_artifacts["modified_path"].append(get_path)
+
+                if (item.cls.startswith('CONF') or item.cls == 'BAMF') \
+                        and item.ext != 'xml' and item.ext != 'arxml':  # look for all bamf files
+                    get_path = get_bamf_file(path)
+                    if get_path is not None \
+                            and get_path not in self.bct_artifacts["bamf_path"]:
+                        self.bct_artifacts["bamf_path"].append(get_path)
+                        self.bct_artifacts["modified_path"].append(get_path)
+            self.pending_files.clear()
+
+            for node in self.selected_damos_artifacts:
+                if table.path[node.artifact]:
+                    self.damos_file_paths["modified_path"].append(
+                        table.path[node.artifact].replace("\\", "/"))
 
             # add the buildframework.cfg, and buildframework-roles.cfg
             self.bct_artifacts["cfg_path"].extend(get_cfg_paths())
@@ -701,6 +748,7 @@ class PVERTreeWidget(QGroupBox):
         except FileNotFoundError as exception:
             logger.error(exception)
             logger.error("Cancel build pver")
+            self.build_button.setEnabled(True)
             return
 
         # Build phase